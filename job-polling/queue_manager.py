@@ -168,6 +168,48 @@ class JobQueueManager:
             logger.error(f"Error adding job {job_id} to queue: {e}")
             return False
     
+    def add_jobs(self, jobs: List[Dict[str, Any]]) -> List[bool]:
+        """Add several jobs to the queue under a single lock acquisition"""
+        results = []
+        queued = []
+        
+        with self.queue_lock:
+            for job_data in jobs:
+                job_id = job_data['id']
+                try:
+                    if self.job_queue.full():
+                        logger.warning(f"Queue is full, cannot add job {job_id}")
+                        results.append(False)
+                        continue
+                    
+                    self.job_queue.put(job_data, block=False)
+                    queued.append(job_data)
+                    results.append(True)
+                
+                except Full:
+                    logger.error(f"Queue full, cannot add job {job_id}")
+                    results.append(False)
+                except Exception as e:
+                    logger.error(f"Error adding job {job_id} to queue: {e}")
+                    results.append(False)
+        
+        # Initialize status for every job that made it into the queue
+        now = datetime.now().isoformat()
+        with self.status_lock:
+            for job_data in queued:
+                self.job_status[job_data['id']] = {
+                    'id': job_data['id'],
+                    'status': os.getenv('JOB_STATUS_QUEUED', 'queued'),
+                    'progress': 0,
+                    'message': 'Job queued for processing',
+                    'created_at': now,
+                    'last_updated': now,
+                    'job_data': job_data
+                }
+        
+        logger.info(f"Added {len(queued)} of {len(jobs)} jobs to queue")
+        return results
+    
     def get_job_status(self, job_id: str) -> Optional[Dict[str, Any]]:
         """Get current status of a job"""
         with self.status_lock:
@@ -53,10 +53,95 @@ import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 import json
+import logging
 import os
+import re
+import weakref
 from base_report import BaseReport
 
+logger = logging.getLogger(__name__)
+
+_DATE_RE = re.compile(r'^(\d{4})-(\d{2})-(\d{2})$')
+_PORTFOLIO_FILTERS = ('all', 'equity', 'fixed_income', 'derivatives')
+_VALID_FILTERS = frozenset(_PORTFOLIO_FILTERS)
+_VALID_CL = frozenset(('95', '99', '99.9'))
+
+# Day-level VaR sums are fixed once a day has closed, so the 30-day trend is
+# kept in a small JSON file keyed by the source file's (path, mtime, size) and
+# only days that are not yet cached are aggregated per run. Only frames that
+# load_data read from that file are cached, and the calculation date itself
+# never is since its rows may still be amended.
+HISTORICAL_CACHE_FILE = 'historical_var_cache.json'
+HISTORICAL_CACHE_DAYS = 90
+
+# Static HTML fragments, built once at import and streamed into the output file
+_HTML_HEAD = """
+        <!DOCTYPE html>
+        <html>
+        <head>
+            <title>Daily VaR Report - {calc_date}</title>
+            <style>
+                body {{ font-family: Arial, sans-serif; margin: 20px; }}
+                .header {{ background: #2563eb; color: white; padding: 20px; margin-bottom: 20px; }}
+                .summary {{ background: #f8fafc; padding: 15px; margin-bottom: 20px; border-left: 4px solid #2563eb; }}
+                table {{ border-collapse: collapse; width: 100%; margin-bottom: 20px; }}
+                th, td {{ border: 1px solid #ddd; padding: 8px; text-align: left; }}
+                th {{ background-color: #f2f2f2; }}
+                .chart-container {{ margin: 20px 0; }}
+                .metric {{ display: inline-block; margin: 10px 20px 10px 0; }}
+                .metric-value {{ font-size: 24px; font-weight: bold; color: #dc2626; }}
+                .metric-label {{ font-size: 14px; color: #6b7280; }}
+            </style>
+        </head>
+        <body>"""
+
+_HTML_PORTFOLIO_TABLE_OPEN = """
+            <h2>Portfolio VaR Breakdown</h2>
+            <table>
+                <thead>
+                    <tr>
+                        <th>Portfolio</th>
+                        <th>Asset Class</th>
+                        <th>Position Value ($)</th>
+                        <th>VaR ($)</th>
+                        <th>VaR %</th>
+                    </tr>
+                </thead>
+                <tbody>
+        """
+
+_HTML_ASSET_CLASS_TABLE_OPEN = """
+            <h2>Asset Class VaR Summary</h2>
+            <table>
+                <thead>
+                    <tr>
+                        <th>Asset Class</th>
+                        <th>Position Value ($)</th>
+                        <th>VaR ($)</th>
+                        <th>VaR %</th>
+                    </tr>
+                </thead>
+                <tbody>
+        """
+
+_HTML_TABLE_CLOSE = """
+                </tbody>
+            </table>
+        """
+
+_HTML_FOOTER_TEMPLATE = """
+            <div style="margin-top: 40px; padding-top: 20px; border-top: 1px solid #ddd; font-size: 12px; color: #6b7280;">
+                <p>Generated by DataFit on {now}</p>
+                <p>This report contains confidential and proprietary information.</p>
+            </div>
+        </body>
+        </html>
+        """
+
 class VarDailyReport(BaseReport):
+    # (weakref to the frame load_data returned, (source signature, portfolio_filter))
+    _loaded_source = None
+    
     def __init__(self):
         super().__init__()
         self.report_id = "var_daily"
@@ -66,24 +151,28 @@ class VarDailyReport(BaseReport):
         """Validate input parameters for VaR report"""
         errors = []
         
-        if not params.get('calculation_date'):
+        calculation_date = params.get('calculation_date')
+        if not calculation_date:
             errors.append("Calculation date is required")
         else:
-            try:
-                calc_date = datetime.strptime(params['calculation_date'], '%Y-%m-%d')
-                if calc_date > datetime.now():
-                    errors.append("Calculation date cannot be in the future")
-            except ValueError:
+            # Cheap shape check first; only build a datetime for well-formed strings
+            m = _DATE_RE.match(calculation_date)
+            calc_date = None
+            if m:
+                try:
+                    calc_date = datetime(int(m.group(1)), int(m.group(2)), int(m.group(3)))
+                except ValueError:
+                    pass
+            if calc_date is None:
                 errors.append("Invalid date format for calculation_date")
+            elif calc_date > datetime.now():
+                errors.append("Calculation date cannot be in the future")
         
-        confidence_level = params.get('confidence_level', '99')
-        if confidence_level not in ['95', '99', '99.9']:
+        if params.get('confidence_level', '99') not in _VALID_CL:
             errors.append("Confidence level must be 95, 99, or 99.9")
         
-        portfolio_filter = params.get('portfolio_filter', 'all')
-        valid_filters = ['all', 'equity', 'fixed_income', 'derivatives']
-        if portfolio_filter not in valid_filters:
-            errors.append(f"Portfolio filter must be one of: {', '.join(valid_filters)}")
+        if params.get('portfolio_filter', 'all') not in _VALID_FILTERS:
+            errors.append(f"Portfolio filter must be one of: {', '.join(_PORTFOLIO_FILTERS)}")
         
         return errors
     
@@ -100,7 +189,10 @@ class VarDailyReport(BaseReport):
         try:
             # Load mock VaR data
             data_path = os.path.join(self.get_data_path(), 'var_daily.csv')
+            source = self._get_source_signature()
             df = pd.read_csv(data_path)
+            if self._get_source_signature() != source:
+                source = None  # File changed while being read, don't cache from it
             
             # Convert date column
             df['date'] = pd.to_datetime(df['date'])
@@ -119,6 +211,10 @@ class VarDailyReport(BaseReport):
             if portfolio_filter != 'all':
                 filtered_df = filtered_df[filtered_df['asset_class'] == portfolio_filter]
             
+            # Remember which file version this exact frame came from
+            if source is not None:
+                self._loaded_source = (weakref.ref(filtered_df), (source, portfolio_filter))
+            
             return filtered_df
             
         except Exception as e:
@@ -138,30 +234,77 @@ class VarDailyReport(BaseReport):
         # Select VaR column based on confidence level
         var_column = f"confidence_{confidence_level.replace('.', '')}"
         
-        # Calculate portfolio-level VaR
-        portfolio_var = current_data.groupby(['portfolio_id', 'portfolio_name']).agg({
-            var_column: 'sum',
-            'position_value': 'sum',
-            'asset_class': 'first'
-        }).reset_index()
+        # Pull the day's columns out once as flat NumPy arrays and aggregate
+        # with bincount rather than going through pandas groupby machinery.
+        # NaN values are zeroed so the sums skip them as groupby would.
+        id_codes, ids = pd.factorize(current_data['portfolio_id'], sort=True)
+        name_codes, names = pd.factorize(current_data['portfolio_name'], sort=True)
+        asset_codes, asset_classes = pd.factorize(current_data['asset_class'], sort=True)
+        var_vals = current_data[var_column].to_numpy(dtype='float64')
+        var_vals = np.where(np.isnan(var_vals), 0.0, var_vals)
+        pos_vals = current_data['position_value'].to_numpy(dtype='float64')
+        pos_vals = np.where(np.isnan(pos_vals), 0.0, pos_vals)
+        
+        # Calculate portfolio-level VaR per (portfolio_id, portfolio_name) pair,
+        # dropping rows where either key is missing
+        keyed = (id_codes >= 0) & (name_codes >= 0)
+        pair_codes = id_codes[keyed] * len(names) + name_codes[keyed]
+        pairs, portfolio_codes = np.unique(pair_codes, return_inverse=True)
+        n_portfolios = len(pairs)
+        
+        # First non-missing asset class per portfolio, NaN if there is none
+        portfolio_asset_class = np.full(n_portfolios, np.nan, dtype=object)
+        with_class = asset_codes[keyed] >= 0
+        groups, first_rows = np.unique(portfolio_codes[with_class], return_index=True)
+        portfolio_asset_class[groups] = asset_classes.to_numpy()[asset_codes[keyed][with_class][first_rows]]
+        
+        portfolio_var = pd.DataFrame({
+            'portfolio_id': ids[pairs // len(names)],
+            'portfolio_name': names[pairs % len(names)],
+            var_column: np.bincount(portfolio_codes, weights=var_vals[keyed], minlength=n_portfolios),
+            'position_value': np.bincount(portfolio_codes, weights=pos_vals[keyed], minlength=n_portfolios),
+            'asset_class': portfolio_asset_class
+        })
         
-        # Calculate total VaR (with diversification benefit)
-        total_var = current_data[var_column].sum() * 0.85  # 15% diversification benefit
-        total_position_value = current_data['position_value'].sum()
+        # Calculate VaR by asset class (rows without an asset class are excluded)
+        classified = asset_codes >= 0
+        asset_codes = asset_codes[classified]
+        n_asset_classes = len(asset_classes)
+        asset_class_var = pd.DataFrame({
+            'asset_class': asset_classes,
+            var_column: np.bincount(asset_codes, weights=var_vals[classified], minlength=n_asset_classes),
+            'position_value': np.bincount(asset_codes, weights=pos_vals[classified], minlength=n_asset_classes)
+        })
         
-        # Calculate VaR by asset class
-        asset_class_var = current_data.groupby('asset_class').agg({
-            var_column: 'sum',
-            'position_value': 'sum'
-        }).reset_index()
+        # Calculate total VaR (with diversification benefit) over every row of the day
+        total_var = var_vals.sum() * 0.85  # 15% diversification benefit
+        total_position_value = pos_vals.sum()
         
         # Calculate VaR percentage of portfolio value
         portfolio_var['var_percentage'] = (portfolio_var[var_column] / portfolio_var['position_value'] * 100).round(2)
         asset_class_var['var_percentage'] = (asset_class_var[var_column] / asset_class_var['position_value'] * 100).round(2)
         
-        # Historical VaR trend (last 30 days)
-        historical_var = df.groupby('date')[var_column].sum().reset_index()
-        historical_var = historical_var.sort_values('date').tail(30)
+        # Historical VaR trend (last 30 days), aggregating only uncached days.
+        # The cache is only used for a frame load_data read from the current file.
+        cache = pd.Series(dtype='float64', index=pd.DatetimeIndex([]))
+        loaded = self._get_loaded_source(df)
+        if loaded is not None:
+            source, portfolio_filter = loaded
+            cache_key = (source, confidence_level, portfolio_filter)
+            # Entries built from an older version of the source file are stale
+            caches = {key: value for key, value in self._load_historical_cache().items() if key[0] == source}
+            cache = caches.get(cache_key, cache)
+        window_dates = pd.DatetimeIndex(df['date'].unique())
+        cached = cache[cache.index.isin(window_dates)]
+        missing = window_dates.difference(cached.index)
+        new = df[df['date'].isin(missing)].groupby('date')[var_column].sum()
+        historical_var = pd.concat([cached, new]).sort_index().tail(30)
+        historical_var = historical_var.rename_axis('date').rename(var_column).reset_index()
+        
+        settled = new[new.index < calc_date]
+        if loaded is not None and len(settled):
+            caches[cache_key] = pd.concat([cache, settled]).sort_index().tail(HISTORICAL_CACHE_DAYS)
+            self._save_historical_cache(caches)
         
         return {
             'portfolio_var': portfolio_var,
@@ -174,6 +317,71 @@ class VarDailyReport(BaseReport):
             'confidence_level': confidence_level
         }
     
+    def _get_historical_cache_path(self):
+        """Return the location of the historical VaR cache file"""
+        return os.path.join(self.get_data_path(), HISTORICAL_CACHE_FILE)
+    
+    def _get_source_signature(self):
+        """Return (path, mtime_ns, size) of the VaR source file, or None if it cannot be read"""
+        data_path = os.path.join(self.get_data_path(), 'var_daily.csv')
+        try:
+            stat = os.stat(data_path)
+        except OSError:
+            return None
+        return (data_path, stat.st_mtime_ns, stat.st_size)
+    
+    def _get_loaded_source(self, df):
+        """Return (source signature, portfolio_filter) if df is the frame load_data last returned"""
+        if self._loaded_source is None:
+            return None
+        frame_ref, loaded = self._loaded_source
+        return loaded if frame_ref() is df else None
+    
+    def _load_historical_cache(self):
+        """Load cached daily VaR sums keyed by (source, confidence_level, portfolio_filter)"""
+        try:
+            with open(self._get_historical_cache_path(), 'r', encoding='utf-8') as f:
+                entries = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Discarding unreadable historical VaR cache: {str(e)}")
+            return {}
+        
+        caches = {}
+        try:
+            for entry in entries:
+                path, mtime_ns, size = entry['source']
+                key = ((str(path), int(mtime_ns), int(size)),
+                       str(entry['confidence_level']), str(entry['portfolio_filter']))
+                days = entry['days']
+                caches[key] = pd.Series(
+                    [float(value) for value in days.values()],
+                    index=pd.DatetimeIndex(pd.to_datetime(list(days.keys()), format='%Y-%m-%d')),
+                    dtype='float64'
+                )
+        except (TypeError, ValueError, KeyError, AttributeError) as e:
+            logger.warning(f"Discarding invalid historical VaR cache: {str(e)}")
+            return {}
+        return caches
+    
+    def _save_historical_cache(self, caches):
+        """Persist daily VaR sums; failures only cost a recomputation next run"""
+        entries = [
+            {
+                'source': list(source),
+                'confidence_level': confidence_level,
+                'portfolio_filter': portfolio_filter,
+                'days': {day.strftime('%Y-%m-%d'): float(value) for day, value in series.items()}
+            }
+            for (source, confidence_level, portfolio_filter), series in caches.items()
+        ]
+        try:
+            with open(self._get_historical_cache_path(), 'w', encoding='utf-8') as f:
+                json.dump(entries, f)
+        except OSError as e:
+            logger.warning(f"Failed to save historical VaR cache: {str(e)}")
+    
     def generate_html_charts(self, metrics, params):
         """Generate Plotly charts for HTML output"""
         charts = {}
@@ -263,10 +471,9 @@ class VarDailyReport(BaseReport):
             # HTML Report
             if 'HTML' in self.get_output_formats():
                 charts = self.generate_html_charts(metrics, params)
-                html_content = self.generate_html_report(metrics, params, charts)
                 html_path = os.path.join(output_path, f"{self.report_id}_report.html")
                 with open(html_path, 'w', encoding='utf-8') as f:
-                    f.write(html_content)
+                    f.writelines(self.iter_html_report(metrics, params, charts))
                 outputs['HTML'] = html_path
             
             # CSV Export
@@ -299,28 +506,16 @@ class VarDailyReport(BaseReport):
     
     def generate_html_report(self, metrics, params, charts):
         """Generate HTML report content"""
+        return ''.join(self.iter_html_report(metrics, params, charts))
+    
+    def iter_html_report(self, metrics, params, charts):
+        """Yield HTML report fragments in document order"""
         calc_date = params['calculation_date']
         confidence_level = metrics['confidence_level']
+        var_column = metrics['var_column']
         
-        html_template = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <title>Daily VaR Report - {calc_date}</title>
-            <style>
-                body {{ font-family: Arial, sans-serif; margin: 20px; }}
-                .header {{ background: #2563eb; color: white; padding: 20px; margin-bottom: 20px; }}
-                .summary {{ background: #f8fafc; padding: 15px; margin-bottom: 20px; border-left: 4px solid #2563eb; }}
-                table {{ border-collapse: collapse; width: 100%; margin-bottom: 20px; }}
-                th, td {{ border: 1px solid #ddd; padding: 8px; text-align: left; }}
-                th {{ background-color: #f2f2f2; }}
-                .chart-container {{ margin: 20px 0; }}
-                .metric {{ display: inline-block; margin: 10px 20px 10px 0; }}
-                .metric-value {{ font-size: 24px; font-weight: bold; color: #dc2626; }}
-                .metric-label {{ font-size: 14px; color: #6b7280; }}
-            </style>
-        </head>
-        <body>
+        yield _HTML_HEAD.format(calc_date=calc_date)
+        yield f"""
             <div class="header">
                 <h1>Daily Value at Risk Report</h1>
                 <p>Calculation Date: {calc_date} | Confidence Level: {confidence_level}%</p>
@@ -341,83 +536,43 @@ class VarDailyReport(BaseReport):
                     <div class="metric-label">VaR as % of Portfolio</div>
                 </div>
             </div>
-            
-            <h2>Portfolio VaR Breakdown</h2>
-            <table>
-                <thead>
-                    <tr>
-                        <th>Portfolio</th>
-                        <th>Asset Class</th>
-                        <th>Position Value ($)</th>
-                        <th>VaR ($)</th>
-                        <th>VaR %</th>
-                    </tr>
-                </thead>
-                <tbody>
-        """
+            """
         
+        yield _HTML_PORTFOLIO_TABLE_OPEN
         for _, row in metrics['portfolio_var'].iterrows():
-            html_template += f"""
+            yield f"""
                     <tr>
                         <td>{row['portfolio_name']}</td>
                         <td>{row['asset_class']}</td>
                         <td>${row['position_value']:,.0f}</td>
-                        <td>${row[metrics['var_column']]:,.0f}</td>
+                        <td>${row[var_column]:,.0f}</td>
                         <td>{row['var_percentage']:.2f}%</td>
                     </tr>
             """
-        
-        html_template += """
-                </tbody>
-            </table>
-        """
+        yield _HTML_TABLE_CLOSE
         
         # Add charts if available
         if charts:
-            html_template += """
+            yield """
             <h2>Visualizations</h2>
             """
             for chart_name, chart_html in charts.items():
-                html_template += f"""
+                yield f"""
                 <div class="chart-container">
                     {chart_html}
                 </div>
                 """
         
-        html_template += f"""
-            <h2>Asset Class VaR Summary</h2>
-            <table>
-                <thead>
-                    <tr>
-                        <th>Asset Class</th>
-                        <th>Position Value ($)</th>
-                        <th>VaR ($)</th>
-                        <th>VaR %</th>
-                    </tr>
-                </thead>
-                <tbody>
-        """
-        
+        yield _HTML_ASSET_CLASS_TABLE_OPEN
         for _, row in metrics['asset_class_var'].iterrows():
-            html_template += f"""
+            yield f"""
                     <tr>
                         <td>{row['asset_class']}</td>
                         <td>${row['position_value']:,.0f}</td>
-                        <td>${row[metrics['var_column']]:,.0f}</td>
+                        <td>${row[var_column]:,.0f}</td>
                         <td>{row['var_percentage']:.2f}%</td>
                     </tr>
             """
+        yield _HTML_TABLE_CLOSE
         
-        html_template += """
-                </tbody>
-            </table>
-            
-            <div style="margin-top: 40px; padding-top: 20px; border-top: 1px solid #ddd; font-size: 12px; color: #6b7280;">
-                <p>Generated by DataFit on """ + datetime.now().strftime('%Y-%m-%d %H:%M:%S') + """</p>
-                <p>This report contains confidential and proprietary information.</p>
-            </div>
-        </body>
-        </html>
-        """
-        
-        return html_template
\ No newline at end of file
+        yield _HTML_FOOTER_TEMPLATE.format(now=datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
@@ -25,13 +25,16 @@ REQUIREMENTS:
 
 import pytest
 import json
-import time
 import uuid
 import requests
-import tempfile
+import requests_mock
 import os
-from unittest.mock import patch, MagicMock
-from datetime import datetime
+from pathlib import Path
+from queue import Empty
+from unittest.mock import patch, MagicMock, DEFAULT
+from datetime import datetime, timedelta
+
+pytestmark = pytest.mark.integration
 
 # Test configuration
 SUBMISSION_BASE_URL = 'http://localhost:5000'
@@ -40,15 +43,18 @@ POLLING_BASE_URL = 'http://localhost:5001'
 class MockReportGenerator:
     """Mock report generator for testing"""
     
-    def __init__(self, report_id='test-report'):
+    def __init__(self, tmp_path: Path, report_id='test-report'):
+        self.root = tmp_path
         self.report_id = report_id
     
     def generate(self, arguments, job_id):
         """Generate mock report files"""
-        # Create temporary files to simulate report generation
-        temp_dir = tempfile.mkdtemp()
+        # Write into a per-job directory under the test's tmp_path
+        temp_dir = self.root / f"job-{job_id}"
+        temp_dir.mkdir(parents=True, exist_ok=True)
         
         files = []
+        now = datetime.now().isoformat()
         
         # Generate HTML report
         html_file = os.path.join(temp_dir, 'report.html')
@@ -60,23 +66,19 @@ class MockReportGenerator:
                 <h1>Test Report</h1>
                 <p>Generated for job: {job_id}</p>
                 <p>Arguments: {json.dumps(arguments)}</p>
-                <p>Generated at: {datetime.now().isoformat()}</p>
+                <p>Generated at: {now}</p>
             </body>
             </html>
             """)
         files.append(html_file)
         
-        # Generate CSV data
+        # Generate CSV data in a single write
         csv_file = os.path.join(temp_dir, 'data.csv')
+        rows = "\n".join(f"{i},{i*10},{now}" for i in range(10))
         with open(csv_file, 'w') as f:
-            f.write("id,value,timestamp\n")
-            for i in range(10):
-                f.write(f"{i},{i*10},{datetime.now().isoformat()}\n")
+            f.write("id,value,timestamp\n" + rows + "\n")
         files.append(csv_file)
         
-        # Simulate processing time
-        time.sleep(0.1)
-        
         return files
 
 @pytest.fixture
@@ -96,44 +98,107 @@ def sample_job_request():
     }
 
 @pytest.fixture
-def mock_services():
+def mock_services(tmp_path):
     """Setup mock services for testing"""
-    # Mock the report generator loading
-    mock_generator = MockReportGenerator()
+    # Mock the report generator loading; output lands in the test's tmp_path
+    mock_generator = MockReportGenerator(tmp_path)
     
-    with patch('job_polling.queue_manager.importlib.util.spec_from_file_location') as mock_spec, \
-         patch('job_polling.queue_manager.importlib.util.module_from_spec') as mock_module:
+    with patch.multiple('job_polling.queue_manager.importlib.util',
+                        spec_from_file_location=DEFAULT,
+                        module_from_spec=DEFAULT) as mocks:
         
         # Setup module loading mock
-        mock_spec.return_value.loader.exec_module = MagicMock()
-        mock_module.return_value = MagicMock()
+        mocks['spec_from_file_location'].return_value.loader.exec_module = MagicMock()
+        mocks['module_from_spec'].return_value = MagicMock()
         
         yield mock_generator
 
+@pytest.fixture(scope="module")
+def queue_manager():
+    """Single JobQueueManager shared by the tests in this module"""
+    from job_polling.queue_manager import JobQueueManager
+    manager = JobQueueManager()
+    yield manager
+    manager.shutdown()
+
+@pytest.fixture(autouse=True)
+def reset_queue(request):
+    """Give each test that uses the shared manager an empty queue"""
+    if 'queue_manager' not in request.fixturenames:
+        return
+    
+    manager = request.getfixturevalue('queue_manager')
+    with manager.queue_lock:
+        while True:
+            try:
+                manager.job_queue.get_nowait()
+            except Empty:
+                break
+            manager.job_queue.task_done()
+    
+    with manager.status_lock:
+        # Cancel leftover work so no earlier test's job runs into this one
+        for future in manager.active_jobs.values():
+            future.cancel()
+        manager.active_jobs.clear()
+        manager.job_status.clear()
+
+@pytest.fixture(scope="module")
+def submission_client():
+    """Flask test client for the submission service"""
+    from job_submission.app import app as submission_app
+    return submission_app.test_client()
+
+@pytest.fixture
+def queued_job_id(queue_manager):
+    """Job freshly added to the shared manager"""
+    job_id = str(uuid.uuid4())
+    job_data = {
+        'id': job_id,
+        'name': 'Status Test Job',
+        'jobDefinitionUri': 'test-report',
+        'arguments': {'test': 'value'},
+        'submitted_by': 'test_user',
+        'priority': 5
+    }
+    assert queue_manager.add_job(job_data) is True
+    return job_id
+
+# (status update applied to a queued job, fields expected afterwards)
+STATUS_TRANSITIONS = [
+    (None, {'status': 'queued', 'progress': 0}),
+    ({
+        'status': 'running',
+        'progress': 25,
+        'message': 'Processing started'
+    }, {'status': 'running', 'progress': 25}),
+    ({
+        'status': 'completed',
+        'progress': 100,
+        'message': 'Processing completed',
+        'output_files': ['report.html', 'data.csv']
+    }, {'status': 'completed', 'progress': 100, 'output_files': ['report.html', 'data.csv']}),
+]
+
 class TestEndToEndWorkflow:
     """Test complete end-to-end workflow"""
     
-    def test_submit_job_to_completion(self, sample_job_request, mock_services):
+    def test_submit_job_to_completion(self, sample_job_request, mock_services, submission_client):
         """Test complete job submission to completion workflow"""
         
         # Step 1: Submit job to submission service
-        with patch('job_submission.app.forward_to_polling_service') as mock_forward, \
-             patch('job_submission.app.validate_report_exists') as mock_validate, \
-             patch('job_submission.app.validate_report_parameters') as mock_validate_params:
+        with patch.multiple('job_submission.app',
+                            forward_to_polling_service=DEFAULT,
+                            validate_report_exists=DEFAULT,
+                            validate_report_parameters=DEFAULT) as mocks:
             
             # Setup mocks
-            mock_validate.return_value = True
-            mock_validate_params.return_value = []
-            mock_forward.return_value = {'estimated_duration': 120}
-            
-            # Import and create submission app
-            from job_submission.app import app as submission_app
-            submission_client = submission_app.test_client()
+            mocks['validate_report_exists'].return_value = True
+            mocks['validate_report_parameters'].return_value = []
+            mocks['forward_to_polling_service'].return_value = {'estimated_duration': 120}
             
             # Submit job
-            response = submission_client.post('/api/jobs',
-                                            data=json.dumps(sample_job_request),
-                                            content_type='application/json')
+            response = submission_client.post('/api/jobs', json=sample_job_request)
             
             assert response.status_code == 201
             job_data = json.loads(response.data)
@@ -143,56 +208,17 @@ class TestEndToEndWorkflow:
             assert job_data['status'] == 'submitted'
             assert 'polling_url' in job_data
     
-    def test_job_status_progression(self):
+    @pytest.mark.parametrize("update,expected", STATUS_TRANSITIONS)
+    def test_job_status_progression(self, queue_manager, queued_job_id, update, expected):
         """Test job status progression through states"""
-        from job_polling.queue_manager import JobQueueManager
-        
-        manager = JobQueueManager()
+        if update is not None:
+            queue_manager._update_job_status(queued_job_id, update)
         
-        # Create test job
-        job_id = str(uuid.uuid4())
-        job_data = {
-            'id': job_id,
-            'name': 'Status Test Job',
-            'jobDefinitionUri': 'test-report',
-            'arguments': {'test': 'value'},
-            'submitted_by': 'test_user',
-            'priority': 5
-        }
-        
-        # Test initial queued status
-        success = manager.add_job(job_data)
-        assert success is True
-        
-        status = manager.get_job_status(job_id)
-        assert status['status'] == 'queued'
-        assert status['progress'] == 0
-        
-        # Test status update to running
-        manager._update_job_status(job_id, {
-            'status': 'running',
-            'progress': 25,
-            'message': 'Processing started'
-        })
-        
-        status = manager.get_job_status(job_id)
-        assert status['status'] == 'running'
-        assert status['progress'] == 25
-        
-        # Test status update to completed
-        manager._update_job_status(job_id, {
-            'status': 'completed',
-            'progress': 100,
-            'message': 'Processing completed',
-            'output_files': ['report.html', 'data.csv']
-        })
-        
-        status = manager.get_job_status(job_id)
-        assert status['status'] == 'completed'
-        assert status['progress'] == 100
-        assert 'output_files' in status
+        status = queue_manager.get_job_status(queued_job_id)
+        for key, value in expected.items():
+            assert status[key] == value
     
-    def test_file_generation_and_storage(self):
+    def test_file_generation_and_storage(self, fs):
         """Test file generation and storage workflow"""
         from job_polling.file_manager import FileManager
         
@@ -203,35 +229,20 @@ class TestEndToEndWorkflow:
         filename = 'test_report.html'
         content = b'<html><body>Test Report Content</body></html>'
         
-        with patch('pathlib.Path.mkdir'), \
-             patch('builtins.open', create=True) as mock_open:
-            
-            file_path = manager.store_file(job_id, filename, content)
-            assert filename in file_path
-            assert f'job-{job_id}' in file_path
+        file_path = manager.store_file(job_id, filename, content)
+        assert filename in file_path
+        assert f'job-{job_id}' in file_path
         
         # Test file listing
-        with patch('os.path.exists', return_value=True), \
-             patch('os.listdir', return_value=['test_report.html']), \
-             patch('os.path.isfile', return_value=True), \
-             patch('os.stat') as mock_stat:
-            
-            # Mock stat info
-            mock_stat.return_value.st_size = len(content)
-            mock_stat.return_value.st_ctime = time.time()
-            mock_stat.return_value.st_mtime = time.time()
-            
-            files = manager.list_job_files(job_id)
-            assert len(files) == 1
-            assert files[0]['filename'] == 'test_report.html'
-            assert files[0]['size'] == len(content)
+        files = manager.list_job_files(job_id)
+        assert len(files) == 1
+        assert files[0]['filename'] == 'test_report.html'
+        assert files[0]['size'] == len(content)
     
-    def test_job_cancellation_workflow(self):
+    def test_job_cancellation_workflow(self, queue_manager, fs):
         """Test job cancellation workflow"""
-        from job_polling.queue_manager import JobQueueManager
         from job_polling.file_manager import FileManager
         
-        queue_manager = JobQueueManager()
         file_manager = FileManager()
         
         # Create and queue job
@@ -259,16 +270,14 @@ class TestEndToEndWorkflow:
         assert status['status'] == 'cancelled'
         
         # Test file cleanup
-        with patch('os.path.exists', return_value=True), \
-             patch('shutil.rmtree') as mock_rmtree:
-            
-            file_manager.cleanup_job_files(job_id)
-            mock_rmtree.assert_called_once()
-    
-    def test_error_handling_workflow(self):
-        """Test error handling across the workflow"""
+        job_dir = file_manager.get_job_directory(job_id)
+        fs.create_file(os.path.join(job_dir, 'report.html'), contents=b'<html></html>')
         
-        # Test invalid job request
+        assert file_manager.cleanup_job_files(job_id) is True
+        assert not os.path.exists(job_dir)
+    
+    def test_invalid_request(self, submission_client):
+        """Test invalid job requests are rejected by the submission service"""
         invalid_request = {
             'name': '',  # Invalid name
             'jobDefinitionUri': 'non-existent-report',
@@ -276,24 +285,15 @@ class TestEndToEndWorkflow:
             'submitted_by': ''
         }
         
-        from job_submission.app import app as submission_app
-        client = submission_app.test_client()
-        
-        response = client.post('/api/jobs',
-                              data=json.dumps(invalid_request),
-                              content_type='application/json')
+        response = submission_client.post('/api/jobs', json=invalid_request)
         
         assert response.status_code == 422
         error_data = json.loads(response.data)
         assert error_data['code'] == 'VALIDATION_ERROR'
-        
-        # Test queue full scenario
-        from job_polling.queue_manager import JobQueueManager
-        
-        manager = JobQueueManager()
-        
-        # Fill queue to capacity
-        with patch.object(manager, 'job_queue') as mock_queue:
+    
+    def test_queue_full(self, queue_manager):
+        """Test jobs are refused once the queue is at capacity"""
+        with patch.object(queue_manager, 'job_queue') as mock_queue:
             mock_queue.full.return_value = True
             
             job_data = {
@@ -303,11 +303,31 @@ class TestEndToEndWorkflow:
                 'arguments': {}
             }
             
-            success = manager.add_job(job_data)
+            success = queue_manager.add_job(job_data)
             assert success is False
     
-    def test_service_communication(self):
+    def test_add_jobs_fills_queue_partway(self, queue_manager):
+        """Test a batch is accepted up to capacity and the rest refused"""
+        for _ in range(queue_manager.max_queue_size - 2):
+            queue_manager.job_queue.put_nowait({'id': str(uuid.uuid4())})
+        
+        jobs = [{
+            'id': str(uuid.uuid4()),
+            'name': f'Batch Job {i}',
+            'jobDefinitionUri': 'test-report',
+            'arguments': {}
+        } for i in range(4)]
+        
+        results = queue_manager.add_jobs(jobs)
+        
+        assert results == [True, True, False, False]
+        assert queue_manager.job_queue.full()
+        for job, accepted in zip(jobs, results):
+            assert (queue_manager.get_job_status(job['id']) is not None) == accepted
+    
+    def test_service_communication(self, monkeypatch):
         """Test communication between services"""
+        from job_submission.app import forward_to_polling_service
         
         # Test submission service to polling service communication
         job_data = {
@@ -317,48 +337,43 @@ class TestEndToEndWorkflow:
             'arguments': {},
             'submitted_by': 'test_user'
         }
+        monkeypatch.setenv('SUBMISSION_TO_POLLING_URL', POLLING_BASE_URL)
+        jobs_url = f"{POLLING_BASE_URL}/api/jobs"
         
-        # Mock successful communication
-        with patch('requests.post') as mock_post:
-            mock_response = MagicMock()
-            mock_response.status_code = 201
-            mock_response.json.return_value = {'status': 'received'}
-            mock_post.return_value = mock_response
-            
-            from job_submission.app import forward_to_polling_service
+        with requests_mock.Mocker() as m:
+            # Mock successful communication
+            m.post(jobs_url, status_code=201, json={'status': 'received'})
             
             result = forward_to_polling_service(job_data)
             assert result is not None
             assert result['status'] == 'received'
-        
-        # Test communication failure
-        with patch('requests.post') as mock_post:
-            mock_post.side_effect = requests.exceptions.ConnectionError('Service unavailable')
+            
+            # Test communication failure (latest registration wins)
+            m.post(jobs_url, exc=requests.exceptions.ConnectionError)
             
             result = forward_to_polling_service(job_data)
             assert result is None
     
-    def test_concurrent_job_processing(self):
+    def test_concurrent_job_processing(self, queue_manager):
         """Test concurrent job processing"""
-        from job_polling.queue_manager import JobQueueManager
+        manager = queue_manager
         
-        manager = JobQueueManager()
-        
-        # Create multiple jobs
-        job_ids = []
-        for i in range(5):
-            job_id = str(uuid.uuid4())
-            job_data = {
-                'id': job_id,
+        # Create multiple jobs and submit them in one batch
+        jobs = [
+            {
+                'id': str(uuid.uuid4()),
                 'name': f'Concurrent Job {i}',
                 'jobDefinitionUri': 'test-report',
                 'arguments': {'index': i},
                 'submitted_by': 'test_user'
             }
-            
-            success = manager.add_job(job_data)
-            assert success is True
-            job_ids.append(job_id)
+            for i in range(5)
+        ]
+        job_ids = [job['id'] for job in jobs]
+        
+        results = manager.add_jobs(jobs)
+        assert all(results)
+        assert len(results) == 5
         
         # Verify all jobs are queued
         for job_id in job_ids:
@@ -369,35 +384,32 @@ class TestEndToEndWorkflow:
         # Test queue size
         assert manager.get_queue_size() == 5
     
-    def test_file_retention_and_cleanup(self):
+    def test_file_retention_and_cleanup(self, fs):
         """Test file retention and cleanup policies"""
         from job_polling.file_manager import FileManager
-        from datetime import datetime, timedelta
         
         manager = FileManager()
         
-        # Mock old files for cleanup
-        with patch('os.listdir') as mock_listdir, \
-             patch('os.path.isdir', return_value=True), \
-             patch('os.path.getmtime') as mock_getmtime, \
-             patch('shutil.rmtree') as mock_rmtree:
-            
-            # Setup old directory
-            old_time = (datetime.now() - timedelta(days=8)).timestamp()
-            mock_listdir.return_value = ['job-old-123', 'job-recent-456']
-            mock_getmtime.side_effect = lambda path: old_time if 'old' in path else time.time()
-            
-            # Run cleanup
-            manager._cleanup_old_files()
-            
-            # Verify old files were removed
-            mock_rmtree.assert_called_once()
+        # Setup one expired and one recent job directory
+        old_dir = os.path.join(manager.storage_path, 'job-old-123')
+        recent_dir = os.path.join(manager.storage_path, 'job-recent-456')
+        fs.create_dir(old_dir)
+        fs.create_dir(recent_dir)
+        old_time = (datetime.now() - timedelta(days=8)).timestamp()
+        os.utime(old_dir, (old_time, old_time))
+        
+        # Run cleanup
+        manager._cleanup_old_files()
+        
+        # Verify only old files were removed
+        assert not os.path.exists(old_dir)
+        assert os.path.exists(recent_dir)
     
     def test_api_contract_validation(self):
         """Test API contracts between services"""
+        from job_submission.models import JobRequest, JobResponse
         
         # Test job submission API contract
-        from job_submission.models import JobRequest, JobResponse
         
         # Valid request
         valid_data = {
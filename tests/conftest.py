@@ -90,6 +90,7 @@ DEPENDENCIES:
 - pytest-benchmark: Performance testing
 - requests-mock: HTTP request mocking
 - freezegun: Time mocking
+- pyfakefs: In-memory filesystem (fs fixture)
 - factory-boy: Test data generation
 
 USAGE EXAMPLES:
@@ -107,6 +108,7 @@ async def test_async_job_processing(async_app, test_job):
 """
 
 import os
+import re
 import pytest
 import tempfile
 import shutil
@@ -114,6 +116,7 @@ from pathlib import Path
 from unittest.mock import Mock, patch
 import json
 from datetime import datetime, timedelta
+from types import MappingProxyType
 import uuid
 
 # Test configuration
@@ -128,8 +131,8 @@ TEST_CONFIG = {
 
 @pytest.fixture(scope="session")
 def test_config():
-    """Test configuration fixture for all tests."""
-    return TEST_CONFIG.copy()
+    """Read-only test configuration fixture for all tests."""
+    return MappingProxyType(TEST_CONFIG)
 
 @pytest.fixture(scope="session")
 def temp_dir():
@@ -139,9 +142,9 @@ def temp_dir():
     yield temp_path
     shutil.rmtree(temp_path, ignore_errors=True)
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_config(temp_dir):
-    """Mock configuration with test values."""
+    """Read-only mock configuration with test values; copy with dict() to mutate."""
     config = {
         'GUI_PORT': 3001,
         'SUBMISSION_PORT': 5001,
@@ -157,7 +160,7 @@ def mock_config(temp_dir):
     os.makedirs(config['FILE_STORAGE_PATH'], exist_ok=True)
     os.makedirs(config['REPORTS_DATA_PATH'], exist_ok=True)
     
-    return config
+    return MappingProxyType(config)
 
 @pytest.fixture
 def sample_report_definitions():
@@ -190,10 +193,10 @@ def sample_report_definitions():
         ]
     }
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_job_request():
-    """Sample job request data for testing."""
-    return {
+    """Read-only sample job request data for testing."""
+    return MappingProxyType({
         "name": "Test Job",
         "jobDefinitionUri": "test-report-1",
         "arguments": {
@@ -201,11 +204,9 @@ def sample_job_request():
         },
         "submitted_by": "test_user",
         "priority": 5
-    }
+    })
 
-@pytest.fixture
-def sample_job_response():
-    """Sample job response data for testing."""
+def _build_job_response():
     job_id = str(uuid.uuid4())
     return {
         "id": job_id,
@@ -214,7 +215,17 @@ def sample_job_response():
         "estimated_duration": 60
     }
 
+@pytest.fixture(scope="session")
+def sample_job_response():
+    """Read-only sample job response data for testing."""
+    return MappingProxyType(_build_job_response())
+
 @pytest.fixture
+def fresh_job_response():
+    """Factory for job responses with a new job ID on each call."""
+    return _build_job_response
+
+@pytest.fixture(scope="session")
 def mock_csv_data():
     """Mock CSV data for report generation."""
     return """date,value,category
@@ -224,11 +235,9 @@ def mock_csv_data():
 2024-01-04,175,C
 2024-01-05,225,B"""
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def create_test_csv_files(temp_dir, mock_csv_data):
     """Create test CSV files in temp directory."""
-    files_created = []
-    
     csv_files = [
         'cmbs_data.csv',
         'rmbs_performance.csv',
@@ -239,14 +248,21 @@ def create_test_csv_files(temp_dir, mock_csv_data):
         'focus_manual.csv'
     ]
     
-    for filename in csv_files:
-        file_path = os.path.join(temp_dir, 'mock-data', filename)
-        os.makedirs(os.path.dirname(file_path), exist_ok=True)
-        
-        with open(file_path, 'w') as f:
-            f.write(mock_csv_data)
-        
-        files_created.append(file_path)
+    data_dir = Path(temp_dir) / 'mock-data'
+    data_dir.mkdir(parents=True, exist_ok=True)
+    
+    # Every file has the same content, so write it once and link the rest
+    first = data_dir / csv_files[0]
+    first.write_text(mock_csv_data)
+    files_created = [str(first)]
+    
+    for filename in csv_files[1:]:
+        dest = data_dir / filename
+        try:
+            os.link(first, dest)
+        except OSError:
+            shutil.copyfile(first, dest)
+        files_created.append(str(dest))
     
     yield files_created
     
@@ -254,96 +270,75 @@ def create_test_csv_files(temp_dir, mock_csv_data):
 
 @pytest.fixture
 def mock_time():
-    """Mock time for consistent testing."""
-    with patch('time.time', return_value=1640995200):  # 2022-01-01 00:00:00
-        with patch('datetime.datetime') as mock_datetime:
-            mock_datetime.now.return_value = datetime(2022, 1, 1, 0, 0, 0)
-            mock_datetime.utcnow.return_value = datetime(2022, 1, 1, 0, 0, 0)
-            yield mock_datetime
+    """Freeze time for consistent testing."""
+    from freezegun import freeze_time
+    
+    with freeze_time("2022-01-01") as frozen:  # 2022-01-01 00:00:00
+        yield frozen
 
 @pytest.fixture
-def mock_uuid():
+def mock_uuid(monkeypatch):
     """Mock UUID generation for predictable testing."""
-    test_uuid = 'test-uuid-1234-5678-9abc-def012345678'
-    with patch('uuid.uuid4', return_value=Mock(spec=uuid.UUID)):
-        with patch('uuid.uuid4().hex', test_uuid):
-            with patch('str') as mock_str:
-                mock_str.return_value = test_uuid
-                yield test_uuid
+    fixed_uuid = uuid.UUID('12345678-1234-5678-9abc-def012345678')
+    monkeypatch.setattr(uuid, 'uuid4', lambda: fixed_uuid)
+    return fixed_uuid
 
 @pytest.fixture
 def mock_requests():
     """Mock external HTTP requests."""
-    with patch('requests.get') as mock_get:
-        with patch('requests.post') as mock_post:
-            with patch('requests.put') as mock_put:
-                with patch('requests.delete') as mock_delete:
-                    
-                    # Configure default responses
-                    mock_get.return_value.status_code = 200
-                    mock_get.return_value.json.return_value = {}
-                    
-                    mock_post.return_value.status_code = 201
-                    mock_post.return_value.json.return_value = {}
-                    
-                    mock_put.return_value.status_code = 200
-                    mock_put.return_value.json.return_value = {}
-                    
-                    mock_delete.return_value.status_code = 204
-                    
-                    yield {
-                        'get': mock_get,
-                        'post': mock_post,
-                        'put': mock_put,
-                        'delete': mock_delete
-                    }
-
-@pytest.fixture
-def mock_file_operations():
-    """Mock file system operations."""
-    with patch('builtins.open', create=True) as mock_open:
-        with patch('os.makedirs') as mock_makedirs:
-            with patch('os.path.exists', return_value=True) as mock_exists:
-                with patch('shutil.rmtree') as mock_rmtree:
-                    yield {
-                        'open': mock_open,
-                        'makedirs': mock_makedirs,
-                        'exists': mock_exists,
-                        'rmtree': mock_rmtree
-                    }
+    import requests_mock
+    
+    with requests_mock.Mocker() as mocker:
+        # Configure default responses
+        mocker.get(requests_mock.ANY, status_code=200, json={})
+        mocker.post(requests_mock.ANY, status_code=201, json={})
+        mocker.put(requests_mock.ANY, status_code=200, json={})
+        mocker.delete(requests_mock.ANY, status_code=204)
+        
+        yield mocker
 
 @pytest.fixture
 def performance_monitor():
     """Performance monitoring fixture for benchmark tests."""
     import time
-    import psutil
-    import threading
+    import resource
+    import tracemalloc
+    
+    def _max_rss_mb():
+        # ru_maxrss is the kernel-tracked peak RSS, reported in KB on Linux
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
     
     class PerformanceMonitor:
         def __init__(self):
             self.start_time = None
             self.end_time = None
-            self.memory_usage = []
-            self.monitoring = False
-            self.monitor_thread = None
+            self.start_rss = 0
+            self.end_rss = 0
+            self._python_peak = None
+            self._tracing = False
+            self._owns_tracing = False
         
-        def start(self):
-            self.start_time = time.time()
-            self.monitoring = True
-            self.monitor_thread = threading.Thread(target=self._monitor_memory)
-            self.monitor_thread.start()
+        def start(self, trace_allocations=False):
+            # tracemalloc slows every allocation, so it only runs on request
+            self._tracing = trace_allocations
+            if trace_allocations:
+                # Leave tracing alone if another tool already enabled it
+                self._owns_tracing = not tracemalloc.is_tracing()
+                if self._owns_tracing:
+                    tracemalloc.start()
+                else:
+                    tracemalloc.reset_peak()
+            self.start_rss = _max_rss_mb()
+            # Timing starts last so tracing setup is not counted
+            self.start_time = time.perf_counter()
         
         def stop(self):
-            self.end_time = time.time()
-            self.monitoring = False
-            if self.monitor_thread:
-                self.monitor_thread.join()
-        
-        def _monitor_memory(self):
-            process = psutil.Process()
-            while self.monitoring:
-                self.memory_usage.append(process.memory_info().rss / 1024 / 1024)  # MB
-                time.sleep(0.1)
+            self.end_time = time.perf_counter()
+            if self._tracing:
+                self._python_peak = tracemalloc.get_traced_memory()[1] / 1024 / 1024  # MB
+                if self._owns_tracing:
+                    tracemalloc.stop()
+            self.end_rss = _max_rss_mb()
         
         @property
         def duration(self):
@@ -353,11 +348,19 @@ def performance_monitor():
         
         @property
         def peak_memory(self):
-            return max(self.memory_usage) if self.memory_usage else 0
+            """Peak process RSS in MB over the process lifetime, as of stop()"""
+            return self.end_rss
+        
+        @property
+        def memory_growth(self):
+            """Increase in peak process RSS in MB between start() and stop()"""
+            return self.end_rss - self.start_rss
         
         @property
-        def avg_memory(self):
-            return sum(self.memory_usage) / len(self.memory_usage) if self.memory_usage else 0
+        def python_peak_memory(self):
+            """Peak Python allocation in MB between start() and stop(), or None
+            unless start(trace_allocations=True) was used"""
+            return self._python_peak
     
     return PerformanceMonitor()
 
@@ -383,21 +386,31 @@ def pytest_configure(config):
         "markers", "slow: mark test as slow running"
     )
 
+# Path and name fragments that imply a marker, matched in a single regex pass
+_PATH_RX = re.compile(r'(test_unit|/unit/|test_integration|/integration/)')
+_NAME_RX = re.compile(r'(benchmark|performance|slow)')
+_PATH_MARKERS = {
+    'test_unit': 'unit',
+    '/unit/': 'unit',
+    'test_integration': 'integration',
+    '/integration/': 'integration'
+}
+_NAME_MARKERS = {
+    'benchmark': 'performance',
+    'performance': 'performance',
+    'slow': 'slow'
+}
+
 def pytest_collection_modifyitems(config, items):
     """Modify test collection to add markers automatically."""
     for item in items:
-        # Add unit marker to tests in unit test directories
-        if "test_unit" in str(item.fspath) or "/unit/" in str(item.fspath):
-            item.add_marker(pytest.mark.unit)
+        path = str(item.fspath)
         
-        # Add integration marker to integration tests
-        if "test_integration" in str(item.fspath) or "/integration/" in str(item.fspath):
-            item.add_marker(pytest.mark.integration)
+        # Add unit/integration markers based on the test's location
+        markers = {_PATH_MARKERS[m] for m in _PATH_RX.findall(path)}
         
-        # Add performance marker to benchmark tests
-        if "benchmark" in item.name or "performance" in item.name:
-            item.add_marker(pytest.mark.performance)
+        # Add performance/slow markers based on the test's name
+        markers.update(_NAME_MARKERS[m] for m in _NAME_RX.findall(item.name))
         
-        # Add slow marker to long-running tests
-        if "slow" in item.name or item.get_closest_marker("slow"):
-            item.add_marker(pytest.mark.slow)
\ No newline at end of file
+        for marker in markers:
+            item.add_marker(getattr(pytest.mark, marker))
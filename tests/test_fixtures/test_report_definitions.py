@@ -14,37 +14,166 @@ TEST CATEGORIES:
 """
 
 import pytest
+import io
 import json
-import yaml
+import re
+import sys
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from functools import lru_cache
 from pathlib import Path
-import tempfile
-import os
-from jsonschema import validate, ValidationError
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# Parameter type -> (accepted Python types, error suffix); dates are checked separately
+_TYPE_CHECKS = {
+    'string': (str, "must be a string"),
+    'integer': (int, "must be an integer"),
+    'number': ((int, float), "must be a number"),
+    'boolean': (bool, "must be a boolean"),
+    'date': (None, "must be a valid date string (YYYY-MM-DD)"),
+    'array': (list, "must be an array"),
+}
+
+# Filename template placeholders such as {portfolio_id}
+_PLACEHOLDER_RE = re.compile(r'\{([A-Za-z_][A-Za-z0-9_]*)\}')
+
+# Compiled parameter patterns, shared by every definition that uses them
+_compile_pattern = lru_cache(maxsize=256)(re.compile)
+
+
+@lru_cache(maxsize=1024)
+def _parse_date(date_string):
+    """Return True if date_string is a YYYY-MM-DD date; results are memoized."""
+    try:
+        datetime.strptime(date_string, '%Y-%m-%d')
+        return True
+    except ValueError:
+        return False
+
+
+@lru_cache(maxsize=256)
+def _parse_template(template):
+    """Split a filename template into literal strings and (name, placeholder) slots.
+    
+    Returns the segments and the set of placeholder names they use.
+    """
+    parts = _PLACEHOLDER_RE.split(template)
+    segments = []
+    for i, part in enumerate(parts):
+        if i % 2:
+            segments.append((part, '{' + part + '}'))
+        elif part:
+            segments.append(part)
+    return tuple(segments), frozenset(parts[1::2])
+
+
+@lru_cache(maxsize=None)
+def _yaml_codec():
+    """Import PyYAML on first use; prefer the libyaml loader and dumper."""
+    import yaml
+    try:
+        from yaml import CSafeLoader as Loader, CSafeDumper as Dumper
+    except ImportError:
+        from yaml import SafeLoader as Loader, SafeDumper as Dumper
+    return yaml, Loader, Dumper
+
+
+def _dumps_json(data):
+    """Serialize data as indented JSON bytes, using orjson's C encoder when installed."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, indent=2).encode()
+
+
+def _loads_json(raw):
+    """Parse JSON bytes, using orjson when installed."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _write_json(data, f):
+    raw = _dumps_json(data)
+    f.write(raw.decode() if isinstance(f, io.TextIOBase) else raw)
+
+
+def _write_yaml(data, f):
+    yaml, _, dumper = _yaml_codec()
+    yaml.dump(data, f, Dumper=dumper, default_flow_style=False)
+
+
+def _read_json(f):
+    return _loads_json(f.read())
+
+
+def _read_yaml(f):
+    yaml, loader, _ = _yaml_codec()
+    return yaml.load(f, Loader=loader)
+
+
+# Definition file formats -> (codec, mode used when opening a path);
+# export is keyed by format name, import by file suffix
+_EXPORTERS = {'json': (_write_json, 'wb'), 'yaml': (_write_yaml, 'w')}
+_IMPORTERS = {'.json': (_read_json, 'rb'), '.yaml': (_read_yaml, 'r'), '.yml': (_read_yaml, 'r')}
+
 
 class ReportDefinition:
     """Report definition with validation and template management."""
     
+    __slots__ = ('report_id', 'name', 'description', 'category', '_parameters',
+                 'output_formats', 'template_config', 'validation_rules',
+                 '_compiled_validator')
+    
     def __init__(self, report_id, name, description, category):
         self.report_id = report_id
         self.name = name
         self.description = description
-        self.category = category
+        # Interned so category index lookups and comparisons hit the identity fast path
+        self.category = sys.intern(category) if isinstance(category, str) else category
         self.parameters = {}
         self.output_formats = []
         self.template_config = {}
         self.validation_rules = {}
+        self._compiled_validator = None
+    
+    @property
+    def parameters(self):
+        """Parameter definitions keyed by name.
+        
+        Reassigning this rebuilds the validator; after editing the dict in
+        place, call invalidate() before the next validate_parameters().
+        """
+        return self._parameters
+    
+    @parameters.setter
+    def parameters(self, value):
+        self._parameters = value
+        self._compiled_validator = None
+    
+    def invalidate(self):
+        """Drop the compiled validator so the next validation rebuilds it."""
+        self._compiled_validator = None
     
     def add_parameter(self, param_name, param_type, required=True, default=None, description="", validation=None):
         """Add a parameter definition to the report."""
         parameter = {
-            'type': param_type,
+            'type': sys.intern(param_type) if isinstance(param_type, str) else param_type,
             'required': required,
             'default': default,
             'description': description,
             'validation': validation or {}
         }
+        if 'pattern' in parameter['validation']:
+            # Compile up front so a bad pattern fails here, not on first use
+            _compile_pattern(parameter['validation']['pattern'])
         self.parameters[param_name] = parameter
+        self._compiled_validator = None
     
     def add_output_format(self, format_type, filename_template, content_type, options=None):
         """Add an output format definition."""
@@ -54,6 +183,7 @@ class ReportDefinition:
             'content_type': content_type,
             'options': options or {}
         }
+        _parse_template(filename_template)  # parse once, ahead of generate_filename
         self.output_formats.append(output_format)
     
     def set_template_config(self, template_path, template_engine='jinja2', options=None):
@@ -66,76 +196,126 @@ class ReportDefinition:
     
     def validate_parameters(self, provided_params):
         """Validate provided parameters against the definition."""
-        errors = []
-        
-        # Check required parameters
-        for param_name, param_def in self.parameters.items():
-            if param_def['required'] and param_name not in provided_params:
-                errors.append(f"Required parameter '{param_name}' is missing")
-        
-        # Validate parameter types and values
-        for param_name, param_value in provided_params.items():
-            if param_name not in self.parameters:
-                errors.append(f"Unknown parameter '{param_name}'")
-                continue
+        if not self.parameters:
+            return [f"Unknown parameter '{param_name}'" for param_name in provided_params]
+        
+        if self._compiled_validator is None:
+            self._compiled_validator = self._compile()
+        return self._compiled_validator(provided_params)
+    
+    def _compile(self):
+        """Build a validator with every parameter's rules resolved up front."""
+        required = tuple(name for name, param_def in self.parameters.items() if param_def['required'])
+        checks = {name: self._build_check(name, param_def) for name, param_def in self.parameters.items()}
+        
+        def validator(provided_params):
+            # Check required parameters
+            errors = [f"Required parameter '{name}' is missing" for name in required if name not in provided_params]
+            
+            # Validate parameter types and values
+            for param_name, param_value in provided_params.items():
+                check = checks.get(param_name)
+                if check is None:
+                    errors.append(f"Unknown parameter '{param_name}'")
+                    continue
+                
+                validation_error = check(param_value)
+                if validation_error:
+                    errors.append(validation_error)
             
-            param_def = self.parameters[param_name]
-            validation_error = self._validate_parameter_value(param_name, param_value, param_def)
-            if validation_error:
-                errors.append(validation_error)
+            return errors
         
-        return errors
+        return validator
     
-    def _validate_parameter_value(self, param_name, value, param_def):
-        """Validate a single parameter value."""
-        expected_type = param_def['type']
+    def _build_check(self, param_name, param_def):
+        """Return a function validating a single value, or None if it passes."""
+        steps = []  # each step returns an error message or None
         
         # Type validation
-        if expected_type == 'string' and not isinstance(value, str):
-            return f"Parameter '{param_name}' must be a string"
-        elif expected_type == 'integer' and not isinstance(value, int):
-            return f"Parameter '{param_name}' must be an integer"
-        elif expected_type == 'number' and not isinstance(value, (int, float)):
-            return f"Parameter '{param_name}' must be a number"
-        elif expected_type == 'boolean' and not isinstance(value, bool):
-            return f"Parameter '{param_name}' must be a boolean"
-        elif expected_type == 'date' and not self._is_valid_date_string(value):
-            return f"Parameter '{param_name}' must be a valid date string (YYYY-MM-DD)"
-        elif expected_type == 'array' and not isinstance(value, list):
-            return f"Parameter '{param_name}' must be an array"
+        spec = _TYPE_CHECKS.get(param_def['type'])
+        if spec:
+            accepted, message = spec
+            message = f"Parameter '{param_name}' {message}"
+            if accepted is None:
+                is_date = self._is_valid_date_string
+                steps.append(lambda value: None if is_date(value) else message)
+            else:
+                steps.append(lambda value: None if isinstance(value, accepted) else message)
         
         # Custom validation rules
         validation_rules = param_def.get('validation', {})
         
-        if 'min_length' in validation_rules and len(str(value)) < validation_rules['min_length']:
-            return f"Parameter '{param_name}' must be at least {validation_rules['min_length']} characters"
-        
-        if 'max_length' in validation_rules and len(str(value)) > validation_rules['max_length']:
-            return f"Parameter '{param_name}' must be at most {validation_rules['max_length']} characters"
+        if 'min_length' in validation_rules or 'max_length' in validation_rules:
+            steps.append(self._length_check(param_name, validation_rules))
         
-        if 'min_value' in validation_rules and value < validation_rules['min_value']:
-            return f"Parameter '{param_name}' must be at least {validation_rules['min_value']}"
+        if 'min_value' in validation_rules:
+            min_value = validation_rules['min_value']
+            min_message = f"Parameter '{param_name}' must be at least {min_value}"
+            steps.append(lambda value: min_message if value < min_value else None)
         
-        if 'max_value' in validation_rules and value > validation_rules['max_value']:
-            return f"Parameter '{param_name}' must be at most {validation_rules['max_value']}"
+        if 'max_value' in validation_rules:
+            max_value = validation_rules['max_value']
+            max_message = f"Parameter '{param_name}' must be at most {max_value}"
+            steps.append(lambda value: max_message if value > max_value else None)
         
-        if 'allowed_values' in validation_rules and value not in validation_rules['allowed_values']:
-            return f"Parameter '{param_name}' must be one of: {validation_rules['allowed_values']}"
+        if 'allowed_values' in validation_rules:
+            allowed = validation_rules['allowed_values']
+            contains = self._membership_test(allowed)
+            allowed_message = f"Parameter '{param_name}' must be one of: {allowed}"
+            steps.append(lambda value: None if contains(value) else allowed_message)
         
         if 'pattern' in validation_rules:
-            import re
-            if not re.match(validation_rules['pattern'], str(value)):
-                return f"Parameter '{param_name}' does not match required pattern"
+            match = _compile_pattern(validation_rules['pattern']).match
+            pattern_message = f"Parameter '{param_name}' does not match required pattern"
+            steps.append(lambda value: None if match(str(value)) else pattern_message)
+        
+        def check(value):
+            for step in steps:
+                error = step(value)
+                if error:
+                    return error
+            return None
+        
+        return check
+    
+    @staticmethod
+    def _length_check(param_name, validation_rules):
+        """Return a step checking min_length and max_length from a single len()."""
+        min_length = validation_rules.get('min_length')
+        max_length = validation_rules.get('max_length')
+        short_message = f"Parameter '{param_name}' must be at least {min_length} characters"
+        long_message = f"Parameter '{param_name}' must be at most {max_length} characters"
+        
+        def check_length(value):
+            # Strings are measured directly; other types keep the str() length
+            length = len(value) if isinstance(value, str) else len(str(value))
+            if min_length is not None and length < min_length:
+                return short_message
+            if max_length is not None and length > max_length:
+                return long_message
+            return None
+        
+        return check_length
+    
+    @staticmethod
+    def _membership_test(allowed):
+        """Return an O(1) membership predicate for allowed, falling back to the list."""
+        try:
+            allowed_set = frozenset(allowed)
+        except TypeError:
+            return lambda value: value in allowed
+        
+        def contains(value):
+            try:
+                return value in allowed_set
+            except TypeError:  # unhashable value, e.g. an array parameter
+                return value in allowed
         
-        return None
+        return contains
     
     def _is_valid_date_string(self, date_string):
         """Validate date string format."""
-        try:
-            datetime.strptime(date_string, '%Y-%m-%d')
-            return True
-        except ValueError:
-            return False
+        return _parse_date(date_string)
     
     def generate_filename(self, format_type, parameters):
         """Generate filename based on template and parameters."""
@@ -144,20 +324,35 @@ class ReportDefinition:
             raise ValueError(f"Output format '{format_type}' not defined")
         
         template = format_def['filename_template']
-        
-        # Simple template variable replacement
-        for param_name, param_value in parameters.items():
-            placeholder = f"{{{param_name}}}"
-            template = template.replace(placeholder, str(param_value))
-        
-        # Replace common placeholders
-        template = template.replace('{timestamp}', datetime.now().strftime('%Y%m%d_%H%M%S'))
-        template = template.replace('{date}', datetime.now().strftime('%Y-%m-%d'))
-        
-        return template
+        segments, fields = _parse_template(template)
+        
+        # Common placeholders, reading the clock once and only if needed
+        substitutions = {}
+        if 'timestamp' in fields or 'date' in fields:
+            now = datetime.now()
+            if 'timestamp' in fields:
+                substitutions['timestamp'] = f"{now:%Y%m%d_%H%M%S}"
+            if 'date' in fields:
+                substitutions['date'] = f"{now:%Y-%m-%d}"
+        substitutions.update(parameters)
+        
+        # Join the pre-parsed segments; unknown placeholders are left as-is
+        parts = []
+        for segment in segments:
+            if isinstance(segment, str):
+                parts.append(segment)
+            else:
+                name, placeholder = segment
+                parts.append(str(substitutions[name]) if name in substitutions else placeholder)
+        return ''.join(parts)
     
     def to_dict(self):
-        """Convert report definition to dictionary."""
+        """Convert report definition to dictionary.
+        
+        A new top-level dict is built on every call, but the nested
+        parameter, format and template dicts are shared with the
+        definition, so treat those as read-only.
+        """
         return {
             'report_id': self.report_id,
             'name': self.name,
@@ -190,15 +385,46 @@ class ReportDefinitionManager:
     
     def __init__(self):
         self.definitions = {}
-        self.categories = set()
+        self.categories = defaultdict(list)  # category -> report_ids
+        # Category each report_id was indexed under, which may differ from the
+        # definition's current category if it was edited after registration
+        self._indexed_category = {}
+    
+    def _unindex(self, report_id):
+        """Remove a report_id from the category index, dropping emptied categories."""
+        category = self._indexed_category.pop(report_id, None)
+        if category is None:
+            return
+        report_ids = self.categories[category]
+        report_ids.remove(report_id)
+        if not report_ids:
+            del self.categories[category]
+    
+    def _index(self, definition):
+        """Add a definition to the category index under its current category."""
+        self.categories[definition.category].append(definition.report_id)
+        self._indexed_category[definition.report_id] = definition.category
     
     def register_definition(self, definition):
         """Register a report definition."""
         if not isinstance(definition, ReportDefinition):
             raise ValueError("Definition must be a ReportDefinition instance")
         
+        self._unindex(definition.report_id)
         self.definitions[definition.report_id] = definition
-        self.categories.add(definition.category)
+        self._index(definition)
+    
+    def bulk_register(self, definitions):
+        """Register many trusted ReportDefinition instances in one update."""
+        incoming = {defn.report_id: defn for defn in definitions}
+        
+        # Drop replaced definitions from their previous category first
+        for report_id in incoming.keys() & self.definitions.keys():
+            self._unindex(report_id)
+        
+        self.definitions.update(incoming)
+        for defn in incoming.values():
+            self._index(defn)
     
     def get_definition(self, report_id):
         """Get a report definition by ID."""
@@ -206,41 +432,57 @@ class ReportDefinitionManager:
     
     def get_definitions_by_category(self, category):
         """Get all definitions in a category."""
-        return [defn for defn in self.definitions.values() if defn.category == category]
+        return [self.definitions[report_id] for report_id in self.categories.get(category, ())]
     
     def list_all_definitions(self):
         """List all registered definitions."""
         return list(self.definitions.values())
     
     def export_definitions(self, file_path, format='json'):
-        """Export definitions to file."""
+        """Export definitions to a file path or a writable file object.
+        
+        JSON may be written to a text or binary stream; YAML needs a text stream.
+        """
         data = {
             'definitions': [defn.to_dict() for defn in self.definitions.values()],
-            'categories': list(self.categories),
+            'categories': [category for category, report_ids in self.categories.items() if report_ids],
             'exported_at': datetime.now().isoformat()
         }
         
-        with open(file_path, 'w') as f:
-            if format.lower() == 'json':
-                json.dump(data, f, indent=2)
-            elif format.lower() == 'yaml':
-                yaml.dump(data, f, default_flow_style=False)
-            else:
-                raise ValueError("Format must be 'json' or 'yaml'")
-    
-    def import_definitions(self, file_path):
-        """Import definitions from file."""
-        with open(file_path, 'r') as f:
-            if file_path.endswith('.json'):
-                data = json.load(f)
-            elif file_path.endswith('.yaml') or file_path.endswith('.yml'):
-                data = yaml.safe_load(f)
-            else:
-                raise ValueError("File must be .json, .yaml, or .yml")
+        exporter = _EXPORTERS.get(format.lower())
+        if exporter is None:
+            raise ValueError("Format must be 'json' or 'yaml'")
         
-        for defn_data in data.get('definitions', []):
-            definition = ReportDefinition.from_dict(defn_data)
-            self.register_definition(definition)
+        write, mode = exporter
+        if hasattr(file_path, 'write'):
+            write(data, file_path)
+        else:
+            with open(file_path, mode) as f:
+                write(data, f)
+    
+    def import_definitions(self, file_path, format=None):
+        """Import definitions from a file path or a readable file object.
+        
+        The format defaults to the path's suffix, or to JSON for file objects.
+        """
+        is_stream = hasattr(file_path, 'read')
+        if format is not None:
+            suffix = '.' + format.lower()
+        else:
+            suffix = '.json' if is_stream else Path(file_path).suffix
+        
+        importer = _IMPORTERS.get(suffix)
+        if importer is None:
+            raise ValueError("File must be .json, .yaml, or .yml")
+        
+        read, mode = importer
+        if is_stream:
+            data = read(file_path)
+        else:
+            with open(file_path, mode) as f:
+                data = read(f)
+        
+        self.bulk_register(ReportDefinition.from_dict(defn_data) for defn_data in data.get('definitions', []))
 
 
 class ReportFixtureFactory:
@@ -423,32 +665,45 @@ class ReportSchemaValidator:
         "additionalProperties": False
     }
     
+    # Validators keyed by schema attribute name, built on first use
+    _validators = None
+    
+    @classmethod
+    def _run(cls, schema_name, instance):
+        """Return (is_valid, error) using the same error selection as jsonschema.validate."""
+        # jsonschema is imported here so loading this module does not pay for it
+        from jsonschema.exceptions import best_match
+        
+        if cls._validators is None:
+            from jsonschema import Draft7Validator
+            
+            # Compile each schema once; validate() would re-check the schema on every call
+            validators = {}
+            for name in ('PARAMETER_SCHEMA', 'OUTPUT_FORMAT_SCHEMA', 'REPORT_DEFINITION_SCHEMA'):
+                schema = getattr(cls, name)
+                Draft7Validator.check_schema(schema)
+                validators[name] = Draft7Validator(schema)
+            cls._validators = validators
+        
+        error = best_match(cls._validators[schema_name].iter_errors(instance))
+        if error is None:
+            return True, None
+        return False, str(error)
+    
     @classmethod
     def validate_parameter(cls, parameter_def):
         """Validate a parameter definition."""
-        try:
-            validate(parameter_def, cls.PARAMETER_SCHEMA)
-            return True, None
-        except ValidationError as e:
-            return False, str(e)
+        return cls._run('PARAMETER_SCHEMA', parameter_def)
     
     @classmethod
     def validate_output_format(cls, output_format):
         """Validate an output format definition."""
-        try:
-            validate(output_format, cls.OUTPUT_FORMAT_SCHEMA)
-            return True, None
-        except ValidationError as e:
-            return False, str(e)
+        return cls._run('OUTPUT_FORMAT_SCHEMA', output_format)
     
     @classmethod
     def validate_report_definition(cls, report_def_dict):
         """Validate a complete report definition."""
-        try:
-            validate(report_def_dict, cls.REPORT_DEFINITION_SCHEMA)
-            return True, None
-        except ValidationError as e:
-            return False, str(e)
+        return cls._run('REPORT_DEFINITION_SCHEMA', report_def_dict)
 
 
 class TestReportDefinition:
@@ -549,6 +804,32 @@ class TestReportDefinition:
         errors = basic_report.validate_parameters({'code': 'ABCDEF'})
         assert len(errors) == 0
     
+    @pytest.mark.unit
+    def test_parameter_validation_after_add_parameter(self, basic_report):
+        basic_report.add_parameter('name', 'string', required=True)
+        assert basic_report.validate_parameters({'name': 'x'}) == []
+
+        # Adding a parameter must rebuild the compiled validator
+        basic_report.add_parameter('count', 'integer', required=True)
+        errors = basic_report.validate_parameters({'name': 'x'})
+        assert errors == ["Required parameter 'count' is missing"]
+
+    @pytest.mark.unit
+    def test_parameter_validation_after_parameter_edits(self, basic_report):
+        basic_report.add_parameter('name', 'string', required=True)
+        assert basic_report.validate_parameters({'name': 'x'}) == []
+
+        # In-place edits take effect once the validator is invalidated
+        basic_report.parameters['name']['required'] = False
+        basic_report.parameters['count'] = {'type': 'integer', 'required': True, 'validation': {}}
+        basic_report.invalidate()
+        errors = basic_report.validate_parameters({})
+        assert errors == ["Required parameter 'count' is missing"]
+
+        # Reassigning parameters rebuilds the validator on its own
+        basic_report.parameters = {'other': {'type': 'string', 'required': False, 'validation': {}}}
+        assert basic_report.validate_parameters({'name': 'x'}) == ["Unknown parameter 'name'"]
+
     @pytest.mark.unit
     def test_filename_generation(self, basic_report):
         basic_report.add_output_format('html', 'report_{portfolio_id}_{date}.html', 'text/html')
@@ -559,7 +840,15 @@ class TestReportDefinition:
         assert 'PORT123456' in filename
         assert filename.endswith('.html')
         assert '{date}' not in filename  # Should be replaced
-    
+
+    @pytest.mark.unit
+    def test_filename_generation_placeholders(self, basic_report):
+        basic_report.add_output_format('csv', '{region}_{date}_{missing}.csv', 'text/csv')
+
+        # Provided parameters win over built-ins; unknown placeholders are kept
+        filename = basic_report.generate_filename('csv', {'region': 'EU', 'date': '2024-06-30'})
+        assert filename == 'EU_2024-06-30_{missing}.csv'
+
     @pytest.mark.unit
     def test_to_dict_conversion(self, basic_report):
         basic_report.add_parameter('test_param', 'string', required=True)
@@ -570,6 +859,24 @@ class TestReportDefinition:
         assert report_dict['report_id'] == 'test_report'
         assert 'test_param' in report_dict['parameters']
         assert len(report_dict['output_formats']) == 1
+        
+        basic_report.set_template_config('templates/test.html')
+        assert basic_report.to_dict()['template_config']['template_path'] == 'templates/test.html'
+    
+    @pytest.mark.unit
+    def test_to_dict_reflects_current_state(self, basic_report):
+        report_dict = basic_report.to_dict()
+        
+        # Editing a returned dict must not leak into later exports
+        report_dict['name'] = 'Tampered'
+        assert basic_report.to_dict()['name'] == 'Test Report'
+        
+        basic_report.name = 'Renamed Report'
+        basic_report.validation_rules = {'max_rows': 10}
+        
+        updated = basic_report.to_dict()
+        assert updated['name'] == 'Renamed Report'
+        assert updated['validation_rules'] == {'max_rows': 10}
     
     @pytest.mark.unit
     def test_from_dict_creation(self):
@@ -636,31 +943,84 @@ class TestReportDefinitionManager:
         assert 'cmbs_user_manual' in risk_report_ids
         assert 'var_daily' in risk_report_ids
         assert 'rmbs_performance' not in risk_report_ids  # Different category
-    
+
+    @pytest.mark.unit
+    def test_reregister_definition_moves_category(self, manager, sample_definitions):
+        definition = sample_definitions[0]
+        manager.register_definition(definition)
+
+        replacement = ReportDefinition(definition.report_id, definition.name,
+                                       definition.description, 'COMPLIANCE')
+        manager.register_definition(replacement)
+
+        assert manager.get_definitions_by_category('RISK_MANAGEMENT') == []
+        assert manager.get_definitions_by_category('COMPLIANCE') == [replacement]
+        assert 'RISK_MANAGEMENT' not in manager.categories
+
+    @pytest.mark.unit
+    def test_reregister_after_category_edit(self, manager, sample_definitions, tmp_path):
+        definition = sample_definitions[0]
+        manager.register_definition(definition)
+
+        # Editing the registered object must not break re-registration
+        definition.category = 'COMPLIANCE'
+        manager.register_definition(definition)
+
+        assert manager.get_definitions_by_category('RISK_MANAGEMENT') == []
+        assert manager.get_definitions_by_category('COMPLIANCE') == [definition]
+
+        export_file = tmp_path / 'definitions.json'
+        manager.export_definitions(str(export_file))
+        assert json.loads(export_file.read_text())['categories'] == ['COMPLIANCE']
+
     @pytest.mark.unit
-    def test_export_import_definitions(self, manager, sample_definitions):
+    def test_export_import_definitions(self, manager, sample_definitions, tmp_path):
         # Register definitions
         for definition in sample_definitions:
             manager.register_definition(definition)
         
         # Export to temporary file
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-            temp_path = f.name
+        temp_path = str(tmp_path / 'definitions.json')
+        manager.export_definitions(temp_path, format='json')
         
-        try:
-            manager.export_definitions(temp_path, format='json')
-            
-            # Create new manager and import
-            new_manager = ReportDefinitionManager()
-            new_manager.import_definitions(temp_path)
-            
-            # Verify import
-            assert len(new_manager.definitions) == len(manager.definitions)
-            for report_id in manager.definitions:
-                assert report_id in new_manager.definitions
-                
-        finally:
-            os.unlink(temp_path)
+        # Create new manager and import
+        new_manager = ReportDefinitionManager()
+        new_manager.import_definitions(temp_path)
+        
+        # Verify import
+        assert len(new_manager.definitions) == len(manager.definitions)
+        for report_id in manager.definitions:
+            assert report_id in new_manager.definitions
+
+    @pytest.mark.unit
+    def test_export_import_yaml(self, manager, sample_definitions, tmp_path):
+        for definition in sample_definitions:
+            manager.register_definition(definition)
+
+        temp_path = str(tmp_path / 'definitions.yaml')
+        manager.export_definitions(temp_path, format='yaml')
+
+        new_manager = ReportDefinitionManager()
+        new_manager.import_definitions(temp_path)
+
+        for report_id, definition in manager.definitions.items():
+            assert new_manager.get_definition(report_id).parameters == definition.parameters
+
+    @pytest.mark.unit
+    def test_export_import_json_without_orjson(self, manager, sample_definitions, tmp_path, monkeypatch):
+        monkeypatch.setitem(globals(), 'orjson', None)
+        for definition in sample_definitions:
+            manager.register_definition(definition)
+        
+        export_path = tmp_path / 'definitions.json'
+        manager.export_definitions(str(export_path), format='json')
+        
+        data = json.loads(export_path.read_text())
+        assert [d['report_id'] for d in data['definitions']] == list(manager.definitions)
+        
+        new_manager = ReportDefinitionManager()
+        new_manager.import_definitions(str(export_path))
+        assert list(new_manager.definitions) == list(manager.definitions)
 
 
 class TestReportFixtureFactory:
@@ -814,22 +1174,27 @@ class TestReportSchemaValidator:
         # Create manager and add fixtures
         manager = ReportDefinitionManager()
         
-        # Add all fixture definitions
-        fixtures = [
-            ReportFixtureFactory.create_cmbs_report_definition(),
-            ReportFixtureFactory.create_rmbs_performance_definition(),
-            ReportFixtureFactory.create_var_daily_definition(),
-            ReportFixtureFactory.create_aml_alerts_definition()
+        # Build and validate all fixture definitions concurrently
+        factories = [
+            ReportFixtureFactory.create_cmbs_report_definition,
+            ReportFixtureFactory.create_rmbs_performance_definition,
+            ReportFixtureFactory.create_var_daily_definition,
+            ReportFixtureFactory.create_aml_alerts_definition
         ]
         
-        for fixture in fixtures:
-            # Validate definition before registering
-            report_dict = fixture.to_dict()
-            is_valid, error = ReportSchemaValidator.validate_report_definition(report_dict)
+        def build_and_validate(factory):
+            fixture = factory()
+            return fixture, ReportSchemaValidator.validate_report_definition(fixture.to_dict())
+        
+        with ThreadPoolExecutor(max_workers=len(factories)) as executor:
+            results = list(executor.map(build_and_validate, factories))
+        
+        # Register serially so the manager only ever has one writer
+        fixtures = []
+        for fixture, (is_valid, error) in results:
             assert is_valid, f"Fixture {fixture.report_id} failed validation: {error}"
-            
-            # Register definition
             manager.register_definition(fixture)
+            fixtures.append(fixture)
         
         # Test retrieval and usage
         cmbs_report = manager.get_definition('cmbs_user_manual')
@@ -850,24 +1215,17 @@ class TestReportSchemaValidator:
         assert 'PORT123456' in filename
         assert filename.endswith('.html')
         
-        # Test export/import cycle
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-            temp_path = f.name
+        # Test export/import cycle in memory
+        buffer = io.BytesIO()
+        manager.export_definitions(buffer)
+        buffer.seek(0)
         
-        try:
-            manager.export_definitions(temp_path)
-            
-            # Import into new manager
-            new_manager = ReportDefinitionManager()
-            new_manager.import_definitions(temp_path)
-            
-            # Verify all definitions were imported correctly
-            assert len(new_manager.definitions) == len(fixtures)
-            for fixture in fixtures:
-                imported_def = new_manager.get_definition(fixture.report_id)
-                assert imported_def is not None
-                assert imported_def.name == fixture.name
-                assert imported_def.category == fixture.category
-                
-        finally:
-            os.unlink(temp_path)
\ No newline at end of file
+        # Import into new manager
+        new_manager = ReportDefinitionManager()
+        new_manager.import_definitions(buffer)
+        
+        # Verify all definitions were imported correctly
+        expected = {(f.report_id, f.name, f.category) for f in fixtures}
+        actual = {(d.report_id, d.name, d.category) for d in new_manager.definitions.values()}
+        assert len(new_manager.definitions) == len(fixtures)
+        assert expected <= actual, f"Missing or changed definitions: {expected - actual}"
\ No newline at end of file
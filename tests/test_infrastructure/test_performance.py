@@ -14,23 +14,160 @@ TEST CATEGORIES:
 """
 
 import pytest
+import numpy as np
 import time
 import threading
 import gc
 import sys
+import tracemalloc
 from unittest.mock import Mock, patch, MagicMock
-from datetime import datetime, timedelta
+from datetime import datetime
 import json
 from collections import defaultdict, OrderedDict
 import weakref
+import zlib
+from array import array
+from bisect import bisect_right
+from functools import lru_cache
+
+try:
+    from lru import LRU
+except ImportError:
+    LRU = None
+
+# Distinguishes a cache miss from a cached None
+_MISSING = object()
+
+# Bound once to skip the module attribute lookup on every timer call
+_time = time.time
+
+# Threshold violations store their metric type as a small integer code
+_METRIC_TYPES = ('response_time', 'memory_usage', 'cpu_usage')
+_METRIC_TYPE_CODES = {name: code for code, name in enumerate(_METRIC_TYPES)}
+
+
+@lru_cache(maxsize=1024)
+def _query_fingerprint(query):
+    """Return a 32-bit query identifier that is stable across processes.
+    
+    Unlike hash(), CRC-32 does not depend on PYTHONHASHSEED or on optional
+    packages, so the same query maps to the same identifier everywhere.
+    """
+    return zlib.crc32(query.encode())
+
+
+@lru_cache(maxsize=256)
+def _rank_positions(count):
+    """Return (last, p50, p95, p99, kth) sorted-order positions for count samples.
+    
+    Small samples report the max for p95/p99. kth is the partition argument
+    that places all of them. Memoized since steady workloads reuse sizes.
+    """
+    last = count - 1
+    p50 = count // 2
+    p95 = int(count * 0.95) if count > 20 else last
+    p99 = int(count * 0.99) if count > 100 else last
+    return last, p50, p95, p99, sorted({0, p50, p95, p99, last})
+
+
+def _current_process():
+    """Return a reusable psutil handle for this process, or None without psutil."""
+    try:
+        import psutil
+        return psutil.Process()
+    except ImportError:
+        return None
+
+
+def _peak_rss_mb():
+    """Return the peak RSS of this process in MB, the best figure without psutil."""
+    try:
+        import resource
+    except ImportError:
+        return 0.0
+    # ru_maxrss is reported in KB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+class _ColumnSeries:
+    """Bounded struct-of-arrays series with one column per field.
+    
+    Numeric fields live in array.array columns and the rest in lists, so a
+    sample costs a few machine words rather than a dict. The newest maxlen
+    rows are kept like deque(maxlen=...); evicted rows are skipped by an
+    offset and compacted away once they outnumber the live ones. Rows are
+    appended in time order, so the first column, float epoch-second
+    timestamps, can be bisected.
+    """
+    
+    __slots__ = ('maxlen', 'fields', '_columns', '_timestamps', '_offset')
+    
+    def __init__(self, maxlen, fields):
+        # fields are (name, typecode) pairs starting with ('timestamp', 'd');
+        # a typecode of None keeps that field in a list
+        self.maxlen = maxlen
+        self.fields = tuple(name for name, _ in fields)
+        self._columns = tuple(array(typecode) if typecode else [] for _, typecode in fields)
+        self._timestamps = self._columns[0]
+        self._offset = 0
+    
+    def append(self, *row):
+        """Append one row, given in field order."""
+        for column, value in zip(self._columns, row):
+            column.append(value)
+        if len(self._timestamps) - self._offset > self.maxlen:
+            self._offset += 1
+            if self._offset >= self.maxlen:
+                for column in self._columns:
+                    del column[:self._offset]
+                self._offset = 0
+    
+    def __len__(self):
+        return len(self._timestamps) - self._offset
+    
+    def window_start(self, cutoff):
+        """Return the index of the first row recorded after cutoff."""
+        return bisect_right(self._timestamps, cutoff, self._offset) - self._offset
+    
+    def column(self, name, start=0):
+        """Return a copy of one field's values from row start onward."""
+        return self._columns[self.fields.index(name)][self._offset + start:]
+    
+    def rows(self, start=0):
+        """Return the rows from start onward as dicts keyed by field name."""
+        columns = [column[self._offset + start:] for column in self._columns]
+        return [dict(zip(self.fields, row)) for row in zip(*columns)]
+
+
+# Column layouts of the PerformanceMonitor series
+_RESPONSE_TIME_FIELDS = (('timestamp', 'd'), ('duration', 'd'), ('operation', None), ('thread_id', 'Q'))
+_MEMORY_USAGE_FIELDS = (('timestamp', 'd'), ('memory_mb', 'd'), ('operation', None))
+_VIOLATION_FIELDS = (('timestamp', 'd'), ('metric_type', 'B'), ('value', 'd'), ('threshold', 'd'))
+
 
 class PerformanceMonitor:
     """Performance monitoring and metrics collection."""
     
-    def __init__(self):
-        self.metrics = defaultdict(list)
+    def __init__(self, history_size=10000, memory_sample_interval=0.0):
+        # Each metric keeps only its most recent history_size entries
+        self.history_size = history_size
+        # Minimum seconds between recorded memory samples; 0 records every call
+        self.memory_sample_interval = memory_sample_interval
+        self._last_memory_sample = None  # (monotonic time, memory_mb)
+        self._process = _current_process()
+        # Samples are stored column-wise; metrics builds dicts on read
+        self._series = {
+            'response_times': _ColumnSeries(history_size, _RESPONSE_TIME_FIELDS),
+            'memory_usage': _ColumnSeries(history_size, _MEMORY_USAGE_FIELDS),
+            'threshold_violations': _ColumnSeries(history_size, _VIOLATION_FIELDS),
+        }
         self.active_timers = {}
-        self.counters = defaultdict(int)
+        # Counters are sharded per thread so increments never contend; each
+        # shard is registered once with its thread and summed on read
+        self._tls = threading.local()
+        self._counter_lock = threading.Lock()
+        self._counter_shards = []  # (thread, shard) pairs
+        self._retired_counters = defaultdict(int)  # totals from finished threads
         self.thresholds = {
             'response_time': 1.0,  # seconds
             'memory_usage': 100,   # MB
@@ -39,31 +176,34 @@ class PerformanceMonitor:
     
     def start_timer(self, operation_name):
         """Start timing an operation."""
-        timer_id = f"{operation_name}_{threading.current_thread().ident}_{time.time()}"
+        # Interned names compare by identity in the timer and metric dicts
+        operation_name = sys.intern(operation_name)
+        tid = threading.get_ident()
+        start_time = _time()
+        timer_id = f"{operation_name}_{tid}_{start_time}"
         self.active_timers[timer_id] = {
             'operation': operation_name,
-            'start_time': time.time(),
-            'thread_id': threading.current_thread().ident
+            'start_time': start_time,
+            'thread_id': tid
         }
         return timer_id
     
     def end_timer(self, timer_id):
-        """End timing an operation and record the duration."""
+        """End timing an operation and record the duration.
+        
+        The recorded entry's 'timestamp' is the end time as float seconds
+        since the epoch (time.time()).
+        """
         if timer_id not in self.active_timers:
             raise PerformanceError(f"Timer {timer_id} not found or already ended")
         
         timer_data = self.active_timers[timer_id]
-        end_time = time.time()
+        end_time = _time()
         duration = end_time - timer_data['start_time']
         
-        metric_entry = {
-            'operation': timer_data['operation'],
-            'duration': duration,
-            'timestamp': datetime.now(),
-            'thread_id': timer_data['thread_id']
-        }
-        
-        self.metrics['response_times'].append(metric_entry)
+        self._series['response_times'].append(
+            end_time, duration, timer_data['operation'], timer_data['thread_id']
+        )
         del self.active_timers[timer_id]
         
         # Check threshold
@@ -73,22 +213,25 @@ class PerformanceMonitor:
         return duration
     
     def record_memory_usage(self, operation=None):
-        """Record current memory usage."""
-        try:
-            import psutil
-            process = psutil.Process()
-            memory_mb = process.memory_info().rss / 1024 / 1024
-        except ImportError:
-            # Fallback method using sys.getsizeof for basic estimation
-            memory_mb = sys.getsizeof(gc.get_objects()) / 1024 / 1024
-        
-        metric_entry = {
-            'operation': operation or 'general',
-            'memory_mb': memory_mb,
-            'timestamp': datetime.now()
-        }
+        """Record current memory usage.
+        
+        Calls within memory_sample_interval of the last recorded sample
+        return that sample without recording a new one. Recorded entries
+        carry a 'timestamp' in float seconds since the epoch (time.time()).
+        """
+        now = time.monotonic()
+        last = self._last_memory_sample
+        if last is not None and now - last[0] < self.memory_sample_interval:
+            return last[1]
+        
+        if self._process is not None:
+            memory_mb = self._process.memory_info().rss / 1024 / 1024
+        else:
+            # Without psutil only the peak, not the current, RSS is available
+            memory_mb = _peak_rss_mb()
+        self._last_memory_sample = (now, memory_mb)
         
-        self.metrics['memory_usage'].append(metric_entry)
+        self._series['memory_usage'].append(_time(), memory_mb, operation or 'general')
         
         # Check threshold
         if memory_mb > self.thresholds['memory_usage']:
@@ -98,131 +241,180 @@ class PerformanceMonitor:
     
     def increment_counter(self, counter_name, value=1):
         """Increment a performance counter."""
-        self.counters[counter_name] += value
+        counter_name = sys.intern(counter_name)
+        try:
+            shard = self._tls.counters
+        except AttributeError:
+            shard = self._tls.counters = defaultdict(int)
+            with self._counter_lock:
+                self._counter_shards.append((threading.current_thread(), shard))
         
-        counter_entry = {
-            'counter': counter_name,
-            'value': self.counters[counter_name],
-            'increment': value,
-            'timestamp': datetime.now()
+        shard[counter_name] += value
+    
+    @property
+    def counters(self):
+        """Counter totals summed across every thread's shard."""
+        with self._counter_lock:
+            totals = defaultdict(int, self._retired_counters)
+            live_shards = []
+            for thread, shard in self._counter_shards:
+                for name, value in dict(shard).items():
+                    totals[name] += value
+                if thread.is_alive():
+                    live_shards.append((thread, shard))
+                else:
+                    # A finished thread's shard can no longer change; fold it in
+                    for name, value in shard.items():
+                        self._retired_counters[name] += value
+            self._counter_shards = live_shards
+        return totals
+    
+    @property
+    def metrics(self):
+        """Recorded samples per metric as dicts, oldest first, built from the columns."""
+        return {
+            'response_times': self._series['response_times'].rows(),
+            'memory_usage': self._series['memory_usage'].rows()
         }
-        
-        self.metrics['counters'].append(counter_entry)
     
     def _record_threshold_violation(self, metric_type, value):
         """Record when a metric exceeds its threshold."""
-        violation_entry = {
-            'metric_type': metric_type,
-            'value': value,
-            'threshold': self.thresholds[metric_type],
-            'timestamp': datetime.now()
-        }
-        
-        self.metrics['threshold_violations'].append(violation_entry)
+        self._series['threshold_violations'].append(
+            _time(), _METRIC_TYPE_CODES[metric_type], value, self.thresholds[metric_type]
+        )
+    
+    def get_threshold_violations(self):
+        """Return the recorded threshold violations as dicts, oldest first.
+        
+        Each 'timestamp' is float seconds since the epoch (time.time()).
+        """
+        violations = self._series['threshold_violations'].rows()
+        for violation in violations:
+            violation['metric_type'] = _METRIC_TYPES[violation['metric_type']]
+        return violations
     
     def get_performance_summary(self, hours=1):
         """Get performance summary for the last N hours."""
-        cutoff_time = datetime.now() - timedelta(hours=hours)
-        
-        # Filter recent metrics
-        recent_response_times = [
-            m for m in self.metrics['response_times']
-            if m['timestamp'] > cutoff_time
-        ]
-        
-        recent_memory_usage = [
-            m for m in self.metrics['memory_usage']
-            if m['timestamp'] > cutoff_time
-        ]
-        
-        recent_violations = [
-            m for m in self.metrics['threshold_violations']
-            if m['timestamp'] > cutoff_time
-        ]
+        cutoff_time = _time() - hours * 3600
+        
+        # Slice each series' window straight out of its columns
+        response_times = self._series['response_times']
+        recent_durations = np.frombuffer(
+            response_times.column('duration', response_times.window_start(cutoff_time)),
+            dtype=np.float64
+        )
+        memory_usage = self._series['memory_usage']
+        recent_memory_usage = np.frombuffer(
+            memory_usage.column('memory_mb', memory_usage.window_start(cutoff_time)),
+            dtype=np.float64
+        )
+        violations = self._series['threshold_violations']
+        recent_violations = len(violations) - violations.window_start(cutoff_time)
         
         summary = {
             'time_period_hours': hours,
-            'response_time_stats': self._calculate_response_time_stats(recent_response_times),
+            'response_time_stats': self._calculate_response_time_stats(recent_durations),
             'memory_stats': self._calculate_memory_stats(recent_memory_usage),
             'counter_totals': dict(self.counters),
-            'threshold_violations': len(recent_violations),
+            'threshold_violations': recent_violations,
             'active_timers': len(self.active_timers)
         }
         
         return summary
     
-    def _calculate_response_time_stats(self, response_times):
-        """Calculate response time statistics."""
-        if not response_times:
+    def _calculate_response_time_stats(self, durations):
+        """Calculate response time statistics from an array of durations."""
+        count = len(durations)
+        if not count:
             return {'count': 0}
         
-        durations = [rt['duration'] for rt in response_times]
-        durations.sort()
+        last, p50, p95, p99, kth = _rank_positions(count)
+        
+        # Partial selection places just these ranks in O(n) rather than sorting
+        ranked = np.partition(durations, kth)
         
         return {
-            'count': len(durations),
-            'min': min(durations),
-            'max': max(durations),
-            'avg': sum(durations) / len(durations),
-            'p50': durations[len(durations) // 2],
-            'p95': durations[int(len(durations) * 0.95)] if len(durations) > 20 else max(durations),
-            'p99': durations[int(len(durations) * 0.99)] if len(durations) > 100 else max(durations)
+            'count': count,
+            'min': float(ranked[0]),
+            'max': float(ranked[last]),
+            'avg': float(durations.mean()),
+            'p50': float(ranked[p50]),
+            'p95': float(ranked[p95]),
+            'p99': float(ranked[p99])
         }
     
     def _calculate_memory_stats(self, memory_usage):
-        """Calculate memory usage statistics."""
-        if not memory_usage:
+        """Calculate memory usage statistics from an array of MB samples."""
+        count = len(memory_usage)
+        if not count:
             return {'count': 0}
         
-        usage_values = [mu['memory_mb'] for mu in memory_usage]
-        
         return {
-            'count': len(usage_values),
-            'min_mb': min(usage_values),
-            'max_mb': max(usage_values),
-            'avg_mb': sum(usage_values) / len(usage_values),
-            'current_mb': usage_values[-1] if usage_values else 0
+            'count': count,
+            'min_mb': float(memory_usage.min()),
+            'max_mb': float(memory_usage.max()),
+            'avg_mb': float(memory_usage.mean()),
+            'current_mb': float(memory_usage[-1])
         }
 
 
+class _OrderedLRU(OrderedDict):
+    """Pure-Python stand-in for lru.LRU, used when lru-dict is not installed.
+    
+    Mirrors the parts of its interface LRUCache relies on: get() marks the
+    key as most recently used and inserting past capacity evicts the oldest.
+    """
+    
+    def __init__(self, size):
+        super().__init__()
+        self.size = size
+    
+    def get(self, key, default=None):
+        try:
+            # Move to end (most recently used) in place
+            self.move_to_end(key)
+        except KeyError:
+            return default
+        return self[key]
+    
+    def __setitem__(self, key, value):
+        if key in self:
+            # Update existing key
+            self.move_to_end(key)
+        elif len(self) >= self.size:
+            # Remove least recently used
+            self.popitem(last=False)
+        
+        OrderedDict.__setitem__(self, key, value)
+
+
 class LRUCache:
     """Least Recently Used cache implementation for performance optimization."""
     
     def __init__(self, max_size=1000):
         self.max_size = max_size
-        self.cache = OrderedDict()
+        # lru-dict keeps recency order and evicts in C; fall back to OrderedDict
+        self.cache = LRU(max_size) if LRU is not None else _OrderedLRU(max_size)
         self.hits = 0
         self.misses = 0
     
     def get(self, key):
         """Get value from cache."""
-        if key in self.cache:
-            # Move to end (most recently used)
-            value = self.cache.pop(key)
-            self.cache[key] = value
-            self.hits += 1
-            return value
-        else:
+        value = self.cache.get(key, _MISSING)
+        if value is _MISSING:
             self.misses += 1
             return None
+        self.hits += 1
+        return value
     
     def put(self, key, value):
         """Put value in cache."""
-        if key in self.cache:
-            # Update existing key
-            self.cache.pop(key)
-        elif len(self.cache) >= self.max_size:
-            # Remove least recently used
-            self.cache.popitem(last=False)
-        
+        # Both backends evict the least recently used entry when full
         self.cache[key] = value
     
     def invalidate(self, key):
         """Remove key from cache."""
-        if key in self.cache:
-            del self.cache[key]
-            return True
-        return False
+        return self.cache.pop(key, _MISSING) is not _MISSING
     
     def clear(self):
         """Clear all cache entries."""
@@ -250,6 +442,11 @@ class DatabaseOptimizer:
     
     def __init__(self):
         self.query_stats = defaultdict(list)
+        # Column copies of all_queries for vectorized analysis
+        self._query_timestamps = array('d')
+        self._query_durations = array('d')
+        self._query_hashes = array('I')
+        self._query_is_slow = array('B')
         self.slow_query_threshold = 1.0  # seconds
         self.connection_pool_size = 10
         self.active_connections = 0
@@ -257,47 +454,50 @@ class DatabaseOptimizer:
     def log_query_performance(self, query, duration, rows_affected=None):
         """Log query performance metrics."""
         query_entry = {
-            'query_hash': hash(query) % 10000,  # Anonymized query identifier
+            'query_hash': _query_fingerprint(query),  # Anonymized query identifier
             'duration': duration,
             'rows_affected': rows_affected,
-            'timestamp': datetime.now(),
+            'timestamp': _time(),
             'is_slow': duration > self.slow_query_threshold
         }
         
         self.query_stats['all_queries'].append(query_entry)
+        self._query_timestamps.append(query_entry['timestamp'])
+        self._query_durations.append(duration)
+        self._query_hashes.append(query_entry['query_hash'])
+        self._query_is_slow.append(query_entry['is_slow'])
         
         if query_entry['is_slow']:
             self.query_stats['slow_queries'].append(query_entry)
     
     def get_query_analysis(self, hours=24):
         """Analyze query performance over time period."""
-        cutoff_time = datetime.now() - timedelta(hours=hours)
+        cutoff_time = _time() - hours * 3600
         
-        recent_queries = [
-            q for q in self.query_stats['all_queries']
-            if q['timestamp'] > cutoff_time
-        ]
+        # Queries are logged in time order, so the window is a suffix of each column
+        start = bisect_right(self._query_timestamps, cutoff_time)
+        total_queries = len(self._query_timestamps) - start
         
-        if not recent_queries:
+        if not total_queries:
             return {'total_queries': 0}
         
-        durations = [q['duration'] for q in recent_queries]
-        slow_queries = [q for q in recent_queries if q['is_slow']]
+        durations = np.frombuffer(self._query_durations[start:], dtype=np.float64)
+        is_slow = np.frombuffer(self._query_is_slow[start:], dtype=np.bool_)
+        slow_hashes = np.frombuffer(self._query_hashes[start:], dtype=np.uint32)[is_slow]
+        slow_count = len(slow_hashes)
         
-        # Group by query hash to find most common slow queries
-        slow_query_counts = defaultdict(int)
-        for sq in slow_queries:
-            slow_query_counts[sq['query_hash']] += 1
+        # Group by query hash to find most common slow queries, ties in first-seen order
+        hashes, first_seen, counts = np.unique(slow_hashes, return_index=True, return_counts=True)
+        top = np.lexsort((first_seen, -counts))[:5]
         
         analysis = {
-            'total_queries': len(recent_queries),
-            'slow_queries': len(slow_queries),
-            'slow_query_rate': len(slow_queries) / len(recent_queries),
-            'avg_duration': sum(durations) / len(durations),
-            'max_duration': max(durations),
-            'min_duration': min(durations),
-            'most_problematic_queries': dict(sorted(slow_query_counts.items(), 
-                                                  key=lambda x: x[1], reverse=True)[:5])
+            'total_queries': total_queries,
+            'slow_queries': slow_count,
+            'slow_query_rate': slow_count / total_queries,
+            'avg_duration': float(durations.mean()),
+            'max_duration': float(durations.max()),
+            'min_duration': float(durations.min()),
+            'most_problematic_queries': {int(hashes[i]): int(counts[i]) for i in top}
         }
         
         return analysis
@@ -341,27 +541,47 @@ class DatabaseOptimizer:
 class MemoryProfiler:
     """Memory usage profiling and leak detection."""
     
-    def __init__(self):
+    def __init__(self, enable_tracemalloc=False):
         self.snapshots = []
         self.object_tracking = defaultdict(int)
+        self._process = _current_process()
+        
+        # tracemalloc attributes growth to source lines; only stop it in
+        # close() if this profiler was the one that started it
+        self.enable_tracemalloc = enable_tracemalloc
+        self._started_tracemalloc = enable_tracemalloc and not tracemalloc.is_tracing()
+        if self._started_tracemalloc:
+            tracemalloc.start(25)
     
-    def take_snapshot(self, label=None):
-        """Take a memory snapshot."""
-        # Force garbage collection before snapshot
-        gc.collect()
-        
-        try:
-            import psutil
-            process = psutil.Process()
-            memory_info = process.memory_info()
+    def close(self):
+        """Stop tracemalloc if this profiler started it."""
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+    
+    def take_snapshot(self, label=None, force=False):
+        """Take a memory snapshot.
+        
+        Pass force=True to run a full garbage collection first and count the
+        gc-tracked objects; both walk the whole heap, so they are off by
+        default and object_count is then None. allocated_blocks, the number
+        of live pymalloc blocks, is always recorded since it costs O(1).
+        """
+        object_count = None
+        if force:
+            gc.collect()
+            object_count = len(gc.get_objects())
+        
+        if self._process is not None:
+            memory_info = self._process.memory_info()
             memory_data = {
                 'rss_mb': memory_info.rss / 1024 / 1024,
                 'vms_mb': memory_info.vms / 1024 / 1024
             }
-        except ImportError:
-            # Fallback method
+        else:
+            # Fallback method: peak rather than current RSS
             memory_data = {
-                'rss_mb': len(gc.get_objects()) * 64 / 1024 / 1024,  # Rough estimate
+                'rss_mb': _peak_rss_mb(),
                 'vms_mb': 0
             }
         
@@ -369,9 +589,12 @@ class MemoryProfiler:
             'label': label or f"snapshot_{len(self.snapshots)}",
             'timestamp': datetime.now(),
             'memory': memory_data,
-            'object_count': len(gc.get_objects()),
+            'object_count': object_count,
+            'allocated_blocks': sys.getallocatedblocks(),
             'gc_stats': gc.get_stats() if hasattr(gc, 'get_stats') else []
         }
+        if self.enable_tracemalloc and tracemalloc.is_tracing():
+            snapshot['tm'] = tracemalloc.take_snapshot()
         
         self.snapshots.append(snapshot)
         return snapshot
@@ -385,16 +608,24 @@ class MemoryProfiler:
         last_snapshot = self.snapshots[-1]
         
         memory_growth = last_snapshot['memory']['rss_mb'] - first_snapshot['memory']['rss_mb']
-        object_growth = last_snapshot['object_count'] - first_snapshot['object_count']
+        # Object counts exist only for snapshots taken with force=True
+        object_growth = None
+        if first_snapshot['object_count'] is not None and last_snapshot['object_count'] is not None:
+            object_growth = last_snapshot['object_count'] - first_snapshot['object_count']
         
         leak_analysis = {
             'memory_growth_mb': memory_growth,
             'object_growth': object_growth,
+            'allocated_block_growth': last_snapshot['allocated_blocks'] - first_snapshot['allocated_blocks'],
             'time_span_minutes': (last_snapshot['timestamp'] - first_snapshot['timestamp']).total_seconds() / 60,
             'growth_rate_mb_per_hour': memory_growth / max(1, (last_snapshot['timestamp'] - first_snapshot['timestamp']).total_seconds() / 3600),
             'potential_leak': memory_growth > threshold_mb
         }
         
+        # Per-line allocation growth, when both snapshots were traced
+        if 'tm' in first_snapshot and 'tm' in last_snapshot:
+            leak_analysis['top_allocations'] = last_snapshot['tm'].compare_to(first_snapshot['tm'], 'lineno')[:10]
+        
         if leak_analysis['potential_leak']:
             leak_analysis['severity'] = 'HIGH' if memory_growth > 50 else 'MEDIUM'
             leak_analysis['recommendation'] = 'Investigate object lifecycle and garbage collection'
@@ -415,6 +646,7 @@ class MemoryProfiler:
         report = {
             'current_memory_mb': latest_snapshot['memory']['rss_mb'],
             'current_object_count': latest_snapshot['object_count'],
+            'current_allocated_blocks': latest_snapshot['allocated_blocks'],
             'snapshots_taken': len(self.snapshots),
             'object_tracking': dict(self.object_tracking),
             'leak_analysis': self.detect_memory_leaks()
@@ -435,6 +667,19 @@ class PerformanceError(Exception):
     pass
 
 
+def _calibrate_spin(target_seconds=1e-4, probe_iterations=10000):
+    """Return how many empty loop iterations take roughly target_seconds."""
+    start = time.perf_counter()
+    for _ in range(probe_iterations):
+        pass
+    elapsed = max(time.perf_counter() - start, 1e-9)
+    return max(1, int(probe_iterations * target_seconds / elapsed))
+
+
+# Busy-spin length for ~100us of simulated work, without sleep()'s scheduler jitter
+_SPIN_ITERS_PER_100US = _calibrate_spin()
+
+
 class TestPerformanceMonitor:
     @pytest.fixture
     def monitor(self):
@@ -454,6 +699,11 @@ class TestPerformanceMonitor:
         assert duration >= 0.1
         assert timer_id not in monitor.active_timers
         assert len(monitor.metrics['response_times']) == 1
+        
+        # Operation names are interned, so repeated names share one object
+        name = "".join(["test_", "operation"])
+        monitor.end_timer(monitor.start_timer(name))
+        assert monitor.metrics['response_times'][1]['operation'] is monitor.metrics['response_times'][0]['operation']
     
     @pytest.mark.unit
     def test_timer_not_found_error(self, monitor):
@@ -468,13 +718,49 @@ class TestPerformanceMonitor:
         assert len(monitor.metrics['memory_usage']) == 1
         assert monitor.metrics['memory_usage'][0]['operation'] == "test_operation"
     
+    @pytest.mark.unit
+    def test_memory_sampling_interval(self):
+        monitor = PerformanceMonitor(memory_sample_interval=60)
+        first = monitor.record_memory_usage("first")
+        
+        # Within the interval the previous sample is returned, not recorded
+        assert monitor.record_memory_usage("second") == first
+        assert len(monitor.metrics['memory_usage']) == 1
+    
     @pytest.mark.unit
     def test_counter_increment(self, monitor):
         monitor.increment_counter("test_counter", 5)
         monitor.increment_counter("test_counter", 3)
         
         assert monitor.counters["test_counter"] == 8
-        assert len(monitor.metrics['counters']) == 2
+        assert monitor.counters["missing"] == 0
+    
+    @pytest.mark.unit
+    def test_counter_increment_across_threads(self, monitor):
+        def work():
+            for _ in range(1000):
+                monitor.increment_counter("requests")
+        
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        monitor.increment_counter("requests")
+        
+        assert monitor.counters["requests"] == 4001
+        # Finished threads' shards are folded in and dropped
+        assert monitor.counters["requests"] == 4001
+        assert len(monitor._counter_shards) == 1
+    
+    @pytest.mark.unit
+    def test_metric_history_is_bounded(self):
+        monitor = PerformanceMonitor(history_size=3)
+        for i in range(5):
+            monitor.record_memory_usage(f"op{i}")
+        
+        assert len(monitor.metrics['memory_usage']) == 3
+        assert monitor.metrics['memory_usage'][0]['operation'] == "op2"
     
     @pytest.mark.unit
     def test_threshold_violation_detection(self, monitor):
@@ -485,10 +771,12 @@ class TestPerformanceMonitor:
         time.sleep(0.1)  # Intentionally exceed threshold
         monitor.end_timer(timer_id)
         
-        assert len(monitor.metrics['threshold_violations']) == 1
-        violation = monitor.metrics['threshold_violations'][0]
+        violations = monitor.get_threshold_violations()
+        assert len(violations) == 1
+        violation = violations[0]
         assert violation['metric_type'] == 'response_time'
         assert violation['value'] > violation['threshold']
+        assert monitor.get_performance_summary()['threshold_violations'] == 1
     
     @pytest.mark.unit
     def test_performance_summary(self, monitor):
@@ -506,6 +794,62 @@ class TestPerformanceMonitor:
         assert summary['memory_stats']['count'] == 1
         assert summary['counter_totals']['requests'] == 10
         assert summary['active_timers'] == 0
+    
+    @pytest.mark.unit
+    def test_summary_excludes_old_entries(self, monitor, monkeypatch):
+        # Record the first entry as if it were taken two hours ago
+        two_hours_ago = time.time() - 7200
+        with monkeypatch.context() as m:
+            m.setitem(globals(), '_time', lambda: two_hours_ago)
+            monitor.record_memory_usage("old")
+        monitor.record_memory_usage("recent")
+        
+        summary = monitor.get_performance_summary(hours=1)
+        assert summary['memory_stats']['count'] == 1
+        assert monitor.metrics['memory_usage'][0]['timestamp'] == two_hours_ago
+    
+    @pytest.mark.unit
+    def test_summary_window_after_history_wraps(self, monkeypatch):
+        monitor = PerformanceMonitor(history_size=4)
+        monitor.thresholds['memory_usage'] = -1  # every sample is a violation
+        
+        # Eight old samples then two recent ones; only the last four are kept
+        two_hours_ago = time.time() - 7200
+        with monkeypatch.context() as m:
+            m.setitem(globals(), '_time', lambda: two_hours_ago)
+            for i in range(8):
+                monitor.record_memory_usage(f"op{i}")
+        for i in range(8, 10):
+            monitor.record_memory_usage(f"op{i}")
+        
+        assert [e['operation'] for e in monitor.metrics['memory_usage']] == ['op6', 'op7', 'op8', 'op9']
+        summary = monitor.get_performance_summary(hours=1)
+        assert summary['memory_stats']['count'] == 2
+        assert summary['threshold_violations'] == 2
+        
+        violations = monitor.get_threshold_violations()
+        assert len(violations) == 4
+        assert [v['metric_type'] for v in violations] == ['memory_usage'] * 4
+        assert all(isinstance(v['timestamp'], float) for v in violations)
+        assert violations[0]['timestamp'] == two_hours_ago
+    
+    @pytest.mark.unit
+    def test_response_time_stats(self, monitor):
+        durations = np.random.default_rng(0).permutation(np.arange(1, 201, dtype=np.float64))
+        stats = monitor._calculate_response_time_stats(durations)
+        
+        assert stats['count'] == 200
+        assert stats['min'] == 1.0
+        assert stats['max'] == 200.0
+        assert stats['avg'] == 100.5
+        assert stats['p50'] == 101.0
+        assert stats['p95'] == 191.0
+        assert stats['p99'] == 199.0
+        
+        # Small samples report the maximum for the upper percentiles
+        small = monitor._calculate_response_time_stats(np.array([3.0, 1.0, 2.0]))
+        assert small['p50'] == 2.0
+        assert small['p95'] == small['p99'] == 3.0
 
 
 class TestLRUCache:
@@ -538,6 +882,20 @@ class TestLRUCache:
         assert cache.get("key3") == "value3"  # Still there
         assert cache.get("key4") == "value4"  # New item
     
+    @pytest.mark.unit
+    def test_update_existing_key_keeps_other_entries(self, cache):
+        cache.put("key1", "value1")
+        cache.put("key2", "value2")
+        cache.put("key3", "value3")
+        
+        # Overwriting a present key must not evict anything
+        cache.put("key1", "updated")
+        
+        assert cache.get("key1") == "updated"
+        assert cache.get("key2") == "value2"
+        assert cache.get("key3") == "value3"
+        assert cache.get_stats()['size'] == 3
+    
     @pytest.mark.unit
     def test_cache_invalidation(self, cache):
         cache.put("key1", "value1")
@@ -607,6 +965,23 @@ class TestDatabaseOptimizer:
         assert analysis['slow_queries'] == 2
         assert analysis['slow_query_rate'] == 0.5
         assert analysis['avg_duration'] == (0.2 + 1.2 + 0.8 + 1.5) / 4
+        assert analysis['max_duration'] == 1.5
+        assert analysis['min_duration'] == 0.2
+        
+        # Both slow queries share a fingerprint
+        slow_hash = optimizer.query_stats['slow_queries'][0]['query_hash']
+        assert analysis['most_problematic_queries'] == {slow_hash: 2}
+    
+    @pytest.mark.unit
+    def test_query_fingerprint_is_stable(self, optimizer):
+        optimizer.log_query_performance("SELECT * FROM users", 0.1)
+        optimizer.log_query_performance("SELECT * FROM users", 0.2)
+        optimizer.log_query_performance("SELECT * FROM orders", 0.3)
+        
+        hashes = [q['query_hash'] for q in optimizer.query_stats['all_queries']]
+        assert hashes[0] == hashes[1] != hashes[2]
+        assert hashes[0] == zlib.crc32(b"SELECT * FROM users")
+        assert all(0 <= h <= 0xFFFFFFFF for h in hashes)
     
     @pytest.mark.unit
     def test_optimization_suggestions(self, optimizer):
@@ -660,19 +1035,45 @@ class TestMemoryProfiler:
     @pytest.mark.unit
     def test_memory_leak_detection_with_growth(self, profiler):
         # Take initial snapshot
-        profiler.take_snapshot("initial")
+        profiler.take_snapshot("initial", force=True)
         
         # Simulate memory growth by creating objects
-        large_list = [f"item_{i}" for i in range(10000)]
+        large_list = [[i] for i in range(10000)]
         
         # Take second snapshot
-        profiler.take_snapshot("after_growth")
+        profiler.take_snapshot("after_growth", force=True)
         
         leak_analysis = profiler.detect_memory_leaks(threshold_mb=1)
         
         assert 'memory_growth_mb' in leak_analysis
-        assert 'object_growth' in leak_analysis
-        assert leak_analysis['object_growth'] > 0
+        assert leak_analysis['object_growth'] >= len(large_list)
+        assert leak_analysis['allocated_block_growth'] > 0
+    
+    @pytest.mark.unit
+    def test_unforced_snapshots_skip_object_count(self, profiler):
+        profiler.take_snapshot("initial")
+        profiler.take_snapshot("later")
+        
+        assert profiler.snapshots[-1]['object_count'] is None
+        assert profiler.snapshots[-1]['allocated_blocks'] > 0
+        assert profiler.detect_memory_leaks()['object_growth'] is None
+    
+    @pytest.mark.unit
+    def test_memory_leak_detection_with_tracemalloc(self):
+        profiler = MemoryProfiler(enable_tracemalloc=True)
+        try:
+            profiler.take_snapshot("initial")
+            retained = [bytearray(1024) for _ in range(1000)]
+            profiler.take_snapshot("after_growth")
+            
+            leak_analysis = profiler.detect_memory_leaks()
+        finally:
+            profiler.close()
+        
+        top = leak_analysis['top_allocations']
+        assert top
+        assert sum(stat.size_diff for stat in top) >= 1024 * 1000
+        assert len(retained) == 1000
     
     @pytest.mark.unit
     def test_object_tracking(self, profiler):
@@ -721,7 +1122,8 @@ class TestMemoryProfiler:
             cached_value = cache.get(cache_key)
             if cached_value is None:
                 # Simulate expensive computation
-                time.sleep(0.001)
+                for _ in range(_SPIN_ITERS_PER_100US):
+                    pass
                 cache.put(cache_key, f"computed_value_{i}")
                 monitor.increment_counter("cache_misses")
             else:
@@ -93,6 +93,7 @@ import uuid
 from unittest.mock import Mock, patch, MagicMock
 from datetime import datetime
 import requests
+import requests_mock
 import time
 
 # Mock imports before importing the module
@@ -157,11 +158,10 @@ class TestJobSubmissionApp:
     def test_submit_job_success(self, app_client, valid_job_request, mock_requests):
         """Test successful job submission."""
         # Configure mock response for polling service
-        mock_requests['post'].return_value.status_code = 201
-        mock_requests['post'].return_value.json.return_value = {
+        mock_requests.post(requests_mock.ANY, status_code=201, json={
             "id": "test-job-id",
             "status": "submitted"
-        }
+        })
         
         response = app_client.post('/api/jobs', json=valid_job_request)
         
@@ -210,7 +210,7 @@ class TestJobSubmissionApp:
     @pytest.mark.unit
     def test_submit_job_polling_service_unavailable(self, app_client, valid_job_request, mock_requests):
         """Test job submission when polling service is unavailable."""
-        mock_requests['post'].side_effect = requests.exceptions.ConnectionError("Service unavailable")
+        mock_requests.post(requests_mock.ANY, exc=requests.exceptions.ConnectionError("Service unavailable"))
         
         app_client.post.return_value.status_code = 503
         app_client.post.return_value.json.return_value = {
@@ -363,7 +363,7 @@ class TestJobSubmissionApp:
         
         assert response.status_code == 201
         assert performance_monitor.duration < 0.5  # Less than 500ms
-        assert performance_monitor.peak_memory < 100  # Less than 100MB
+        assert performance_monitor.memory_growth < 100  # Less than 100MB
     
     @pytest.mark.performance
     def test_concurrent_job_submissions(self, app_client, valid_job_request):
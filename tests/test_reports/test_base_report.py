@@ -465,7 +465,7 @@ class TestBaseReport:
         
         assert result['status'] == 'completed'
         assert performance_monitor.duration < 5.0  # Less than 5 seconds for mock
-        assert performance_monitor.peak_memory < 50  # Less than 50MB for mock
+        assert performance_monitor.memory_growth < 50  # Less than 50MB for mock
     
     @pytest.mark.security
     def test_path_traversal_prevention(self, base_report):
@@ -0,0 +1,177 @@
+"""
+=============================================================================
+VAR DAILY REPORT CALCULATION TESTS
+=============================================================================
+Purpose: Tests for the VaR aggregation and historical trend cache
+Module: reports/var_daily_report.py
+
+TEST CATEGORIES:
+1. Historical Trend Cache
+2. Aggregation Equivalence
+=============================================================================
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'reports'))
+var_daily_report = pytest.importorskip('var_daily_report')
+VarDailyReport = var_daily_report.VarDailyReport
+
+CALC_DATE = '2024-01-10'
+
+
+def _make_var_data():
+    rows = []
+    for day in pd.date_range('2024-01-01', CALC_DATE):
+        for i, asset_class in enumerate(['equity', 'fixed_income', 'derivatives']):
+            rows.append({
+                'date': day,
+                'portfolio_id': f'P{i}',
+                'portfolio_name': f'Portfolio {i}',
+                'asset_class': asset_class,
+                'position_value': 1000.0 * (i + 1),
+                'confidence_99': float(day.day * 10 + i),
+            })
+    return pd.DataFrame(rows)
+
+
+@pytest.fixture
+def report(tmp_path):
+    """VarDailyReport reading from tmp_path, bypassing the BaseReport setup"""
+    instance = VarDailyReport.__new__(VarDailyReport)
+    instance.get_data_path = lambda: str(tmp_path)
+    return instance
+
+
+@pytest.fixture
+def var_data(tmp_path):
+    df = _make_var_data()
+    df.to_csv(tmp_path / 'var_daily.csv', index=False)
+    return df
+
+
+PARAMS = {'calculation_date': CALC_DATE, 'confidence_level': '99'}
+
+
+class TestHistoricalCache:
+
+    def test_trend_matches_groupby(self, report, var_data):
+        metrics = report.calculate_var_metrics(report.load_data(PARAMS), PARAMS)
+        expected = var_data.groupby('date')['confidence_99'].sum().reset_index().sort_values('date').tail(30)
+        pd.testing.assert_frame_equal(
+            metrics['historical_var'].reset_index(drop=True), expected.reset_index(drop=True),
+            check_freq=False
+        )
+
+    def test_only_settled_days_are_cached(self, report, var_data):
+        report.calculate_var_metrics(report.load_data(PARAMS), PARAMS)
+        caches = report._load_historical_cache()
+        assert len(caches) == 1
+        cached = next(iter(caches.values()))
+        assert cached.index.max() < pd.Timestamp(CALC_DATE)
+        assert len(cached) == 9
+
+    def test_cache_hit_reuses_stored_sums(self, report, var_data):
+        report.calculate_var_metrics(report.load_data(PARAMS), PARAMS)
+        caches = report._load_historical_cache()
+        key = next(iter(caches))
+        caches[key].iloc[0] = -1.0
+        report._save_historical_cache(caches)
+
+        metrics = report.calculate_var_metrics(report.load_data(PARAMS), PARAMS)
+        assert metrics['historical_var']['confidence_99'].iloc[0] == -1.0
+
+    def test_source_change_invalidates_cache(self, report, var_data, tmp_path):
+        report.calculate_var_metrics(report.load_data(PARAMS), PARAMS)
+        caches = report._load_historical_cache()
+        key = next(iter(caches))
+        caches[key].iloc[0] = -1.0
+        report._save_historical_cache(caches)
+
+        with open(tmp_path / 'var_daily.csv', 'a') as f:
+            f.write('\n')
+
+        metrics = report.calculate_var_metrics(report.load_data(PARAMS), PARAMS)
+        assert metrics['historical_var']['confidence_99'].iloc[0] != -1.0
+        assert all(k[0] != key[0] for k in report._load_historical_cache())
+
+    def test_frames_not_from_load_data_skip_cache(self, report, var_data, tmp_path):
+        cache_file = tmp_path / var_daily_report.HISTORICAL_CACHE_FILE
+
+        # A caller-built frame, even with the source file present
+        report.calculate_var_metrics(var_data, PARAMS)
+        assert not cache_file.exists()
+
+        # A loaded frame that was filtered further is no longer the file's data
+        loaded = report.load_data(PARAMS)
+        report.calculate_var_metrics(loaded[loaded['portfolio_id'] == 'P0'], PARAMS)
+        assert not cache_file.exists()
+
+        report.calculate_var_metrics(loaded, PARAMS)
+        assert cache_file.exists()
+
+    def test_cache_round_trips_as_json(self, report, var_data, tmp_path):
+        report.calculate_var_metrics(report.load_data(PARAMS), PARAMS)
+        cache_file = tmp_path / var_daily_report.HISTORICAL_CACHE_FILE
+
+        entries = json.loads(cache_file.read_text())
+        assert entries[0]['confidence_level'] == '99'
+        assert entries[0]['portfolio_filter'] == 'all'
+        assert entries[0]['days']['2024-01-01'] == 10 + 11 + 12
+
+    def test_invalid_cache_is_discarded(self, report, tmp_path, caplog):
+        cache_file = tmp_path / var_daily_report.HISTORICAL_CACHE_FILE
+
+        cache_file.write_text(json.dumps({'not': 'a list of entries'}))
+        assert report._load_historical_cache() == {}
+
+        cache_file.write_text('garbage')
+        assert report._load_historical_cache() == {}
+        assert 'historical VaR cache' in caplog.text
+
+
+class TestAggregation:
+
+    def test_portfolio_var_matches_groupby(self, report, var_data):
+        day = var_data[var_data['date'] == pd.Timestamp(CALC_DATE)]
+        extra = pd.DataFrame([
+            # Same id under a second name is its own group
+            {'portfolio_id': 'P0', 'portfolio_name': 'Renamed', 'asset_class': None,
+             'position_value': 50.0, 'confidence_99': 5.0},
+            {'portfolio_id': 'P0', 'portfolio_name': 'Renamed', 'asset_class': 'equity',
+             'position_value': 25.0, 'confidence_99': np.nan},
+            # Rows missing either key are dropped
+            {'portfolio_id': None, 'portfolio_name': 'Orphan', 'asset_class': 'equity',
+             'position_value': 10.0, 'confidence_99': 1.0},
+            {'portfolio_id': 'P9', 'portfolio_name': None, 'asset_class': 'equity',
+             'position_value': 10.0, 'confidence_99': 1.0},
+            # A portfolio without any asset class keeps NaN
+            {'portfolio_id': 'P8', 'portfolio_name': 'Unclassified', 'asset_class': None,
+             'position_value': 10.0, 'confidence_99': 2.0},
+        ]).assign(date=pd.Timestamp(CALC_DATE))
+        day = pd.concat([day, extra], ignore_index=True)
+
+        metrics = report.calculate_var_metrics(day, PARAMS)
+        expected = day.groupby(['portfolio_id', 'portfolio_name']).agg({
+            'confidence_99': 'sum',
+            'position_value': 'sum',
+            'asset_class': 'first'
+        }).reset_index()
+
+        actual = metrics['portfolio_var'].drop(columns='var_percentage')
+        pd.testing.assert_frame_equal(actual, expected, check_dtype=False)
+
+    def test_totals_include_unclassified_rows(self, report, var_data):
+        day = var_data[var_data['date'] == pd.Timestamp(CALC_DATE)].copy()
+        day.loc[day.index[0], 'asset_class'] = None
+        day.loc[day.index[1], 'confidence_99'] = np.nan
+
+        metrics = report.calculate_var_metrics(day, PARAMS)
+        assert metrics['total_var'] == pytest.approx(day['confidence_99'].sum() * 0.85)
+        assert metrics['total_position_value'] == pytest.approx(day['position_value'].sum())